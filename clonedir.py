@@ -64,12 +64,14 @@ def compile_pattern(pat: str, ignore_case: bool, use_glob: bool) -> re.Pattern:
 def compile_patterns(pats: List[str], ignore_case: bool, use_glob: bool) -> List[re.Pattern]:
     return [compile_pattern(p, ignore_case, use_glob) for p in pats]
 
+SIZE_MULTIPLIERS = {"k": 1 << 10, "m": 1 << 20, "g": 1 << 30}
+
 def parse_size(s: str) -> int:
     """Parse human-friendly size strings into bytes. e.g. 10K, 20M, 3G."""
-    multipliers = {"k": 1024, "m": 1024**2, "g": 1024**3}
     s = s.strip().lower()
-    if s[-1] in multipliers:
-        return int(float(s[:-1]) * multipliers[s[-1]])
+    mult = SIZE_MULTIPLIERS.get(s[-1:])
+    if mult:
+        return int(float(s[:-1]) * mult)
     return int(s)
 
 def should_copy(p: Path, src: Path, patterns: List[re.Pattern], match_on: str,
@@ -1,5 +1,7 @@
 # media_tool/__main__.py
+import sys
+
 from .main import main
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
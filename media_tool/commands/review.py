@@ -6,13 +6,14 @@ Review and correction command implementations for the Media Consolidation Tool.
 """
 
 import csv
+import re
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Tuple
 from ..config import REVIEW_STATUSES, LARGE_FILE_BYTES
 from ..database.manager import DatabaseManager
 from ..utils.path import ensure_dir
 from ..utils.time import now_iso, utc_now_str
-from ..jsonio import success, error
+from ..jsonio import success, error, stream_records
 
 
 def cmd_make_original(db_manager: DatabaseManager, central: Path, file_id: int, as_json: bool = False):
@@ -151,8 +152,10 @@ def cmd_mark(db_manager: DatabaseManager, file_id: int, new_status: str, note: O
 
         old_status, file_path = row
 
-        conn.execute("UPDATE files SET review_status=?, reviewed_at=?, review_note=? WHERE file_id=?",
-                    (new_status, now_iso(), note, file_id))
+        # Re-marking with the same status and note writes nothing
+        conn.execute("""UPDATE files SET review_status=?, reviewed_at=?, review_note=?
+                        WHERE file_id=? AND (review_status IS NOT ? OR review_note IS NOT ?)""",
+                    (new_status, now_iso(), note, file_id, new_status, note))
         conn.commit()
         
     if as_json:
@@ -180,9 +183,10 @@ def cmd_mark_group(db_manager: DatabaseManager, group_id: int, new_status: str,
                 print("Group not found")
                 return
         
-        # Update all files in the group
-        cursor = conn.execute("UPDATE files SET review_status=?, reviewed_at=?, review_note=? WHERE group_id=?", 
-                             (new_status, now_iso(), note, group_id))
+        # Update the files in the group that are not already in that state
+        cursor = conn.execute("""UPDATE files SET review_status=?, reviewed_at=?, review_note=?
+                                 WHERE group_id=? AND (review_status IS NOT ? OR review_note IS NOT ?)""", 
+                             (new_status, now_iso(), note, group_id, new_status, note))
         conn.commit()
         updated_count = cursor.rowcount or 0
 
@@ -197,21 +201,84 @@ def cmd_mark_group(db_manager: DatabaseManager, group_id: int, new_status: str,
         print(f"Marked group {group_id} as {new_status} ({updated_count} files updated)")
 
 
+def _regex_literal_prefix(pattern: str) -> Tuple[str, bool]:
+    """
+    Return the literal text every match of pattern must start with, and
+    whether it is anchored to the start of the string ('^/photos/').
+    Conservative: gives up ('', False) on alternation.
+    """
+    if '|' in pattern:
+        return '', False
+    anchored = pattern.startswith('^')
+    i = 1 if anchored else 0
+    literal = []
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == '\\' and i + 1 < len(pattern) and not pattern[i + 1].isalnum():
+            ch, step = pattern[i + 1], 2
+        elif ch in '.^$*+?{}[]()\\':
+            break
+        else:
+            step = 1
+        # A quantifier makes the character before it optional
+        if i + step < len(pattern) and pattern[i + step] in '*?{':
+            break
+        literal.append(ch)
+        i += step
+    return ''.join(literal), anchored
+
+
+def _pattern_to_sql(conn, pattern: str, is_regex: bool) -> Tuple[str, List[str]]:
+    """
+    Return a WHERE clause and parameters matching path_on_drive against pattern.
+
+    LIKE patterns are passed through unchanged; with idx_files_path_nocase a
+    pattern that starts with a literal ('/photos/%') is answered by an index
+    range instead of a scan. Regex patterns are compiled once here and
+    matched by a SQL function bound to the compiled pattern, so each row
+    costs one search() rather than a compile, behind a LIKE on any literal
+    text the pattern requires. Raises re.error for a bad regex.
+    """
+    if not is_regex:
+        return "path_on_drive LIKE ?", [pattern]
+
+    compiled = re.compile(pattern)
+    conn.create_function("path_matches", 1,
+                         lambda path: path is not None and compiled.search(path) is not None,
+                         deterministic=True)
+
+    # A literal run the regex requires becomes a LIKE prefilter, so rows
+    # without it never reach Python; anchored, it seeks the NOCASE index.
+    # LIKE is case-insensitive, so it only ever over-selects.
+    literal, anchored = _regex_literal_prefix(pattern)
+    if literal and '%' not in literal and '_' not in literal:
+        like = f"{literal}%" if anchored else f"%{literal}%"
+        return "path_on_drive LIKE ? AND path_matches(path_on_drive)", [like]
+    return "path_matches(path_on_drive)", []
+
+
 def cmd_bulk_mark(db_manager: DatabaseManager, path_like: str, new_status: str, 
-                 limit: int = 100, preview: bool = False, as_json: bool = False):
-    """Bulk mark files by path pattern."""
+                 limit: int = 100, preview: bool = False, as_json: bool = False,
+                 regex: bool = False):
+    """Bulk mark files by path pattern (SQL LIKE, or a regular expression with regex=True)."""
     with db_manager.get_connection() as conn:
-        # Get matches
-        matches = conn.execute(
-            "SELECT file_id, path_on_drive FROM files WHERE path_on_drive LIKE ? LIMIT ?",
-            (path_like, limit)
-        ).fetchall()
-
-        total_matches = conn.execute("SELECT COUNT(1) FROM files WHERE path_on_drive LIKE ?", (path_like,)).fetchone()[0]
-        
-        sample_files = [{"file_id": f, "path_on_drive": p} for (f, p) in matches]
+        try:
+            where, params = _pattern_to_sql(conn, path_like, regex)
+        except re.error as e:
+            if as_json:
+                return error("bulk-mark", f"Invalid regex: {e}")
+            else:
+                print(f"Invalid regex: {e}")
+                return
 
         if preview:
+            matches = conn.execute(
+                f"SELECT file_id, path_on_drive FROM files WHERE {where} LIMIT ?",
+                (*params, limit)
+            ).fetchall()
+            total_matches = conn.execute(f"SELECT COUNT(1) FROM files WHERE {where}", params).fetchone()[0]
+            sample_files = [{"file_id": f, "path_on_drive": p} for (f, p) in matches]
+
             if as_json:
                 return success("bulk-mark", {
                     "mode": "preview",
@@ -227,9 +294,10 @@ def cmd_bulk_mark(db_manager: DatabaseManager, path_like: str, new_status: str,
                     print(f"  {file_id}: {path}")
                 return
 
-        # Apply changes
-        conn.execute("UPDATE files SET review_status=?, reviewed_at=? WHERE path_on_drive LIKE ?", 
-                    (new_status, now_iso(), path_like))
+        # Apply changes, rewriting only rows whose status actually changes
+        files_updated = conn.execute(
+            f"UPDATE files SET review_status=?, reviewed_at=? WHERE {where} AND review_status IS NOT ?",
+            (new_status, now_iso(), *params, new_status)).rowcount
         conn.commit()
 
     if as_json:
@@ -237,41 +305,53 @@ def cmd_bulk_mark(db_manager: DatabaseManager, path_like: str, new_status: str,
             "mode": "apply",
             "pattern": path_like,
             "new_status": new_status,
-            "total_matches": int(total_matches),
+            "files_updated": files_updated,
             "limit": limit
         })
     else:
-        print(f"Bulk marked {total_matches} files as {new_status}")
+        print(f"Bulk marked {files_updated} files as {new_status}")
 
 
-def cmd_review_queue(db_manager: DatabaseManager, limit: int = 100, as_json: bool = False):
-    """Show review queue."""
+_REVIEW_QUEUE_SQL = """
+    SELECT file_id, COALESCE(group_id, -1), type, width, height, size_bytes, 
+           review_status, path_on_drive
+    FROM files
+    WHERE review_status='undecided'
+    ORDER BY created_at DESC
+    LIMIT ?
+"""
+
+
+def _review_queue_item(row) -> dict:
+    file_id, gid, typ, w, h, size, status, path = row
+    return {
+        "file_id": file_id,
+        "group_id": gid if gid != -1 else None,
+        "type": typ,
+        "width": w,
+        "height": h,
+        "dimensions": f"{w}x{h}" if (w and h) else None,
+        "size_bytes": size,
+        "review_status": status,
+        "path_on_drive": path
+    }
+
+
+def cmd_review_queue(db_manager: DatabaseManager, limit: int = 100, as_json: bool = False,
+                     stream: bool = False):
+    """Show review queue (with stream=True and as_json, one JSON item per line)."""
     with db_manager.get_connection() as conn:
-        rows = conn.execute("""
-            SELECT file_id, COALESCE(group_id, -1), type, width, height, size_bytes, 
-                   review_status, path_on_drive
-            FROM files
-            WHERE review_status='undecided'
-            ORDER BY created_at DESC
-            LIMIT ?
-        """, (limit,)).fetchall()
+        cursor = conn.execute(_REVIEW_QUEUE_SQL, (limit,))
+        if as_json and stream:
+            # Items go out as the cursor yields them; nothing is collected first
+            return stream_records("review-queue", map(_review_queue_item, cursor))
+        if as_json:
+            # Built straight from the cursor, without a list of raw rows first
+            items = list(map(_review_queue_item, cursor))
+        else:
+            rows = cursor.fetchall()
     
     if as_json:
-        items = []
-        for r in rows:
-            file_id, gid, typ, w, h, size, status, path = r
-            items.append({
-                "file_id": file_id,
-                "group_id": gid if gid != -1 else None,
-                "type": typ,
-                "width": w,
-                "height": h,
-                "dimensions": f"{w}x{h}" if (w and h) else None,
-                "size_bytes": size,
-                "review_status": status,
-                "path_on_drive": path
-            })
-        
         return success("review-queue", {
             "items": items,
             "count": len(items),
@@ -292,6 +372,10 @@ def cmd_review_queue(db_manager: DatabaseManager, limit: int = 100, as_json: boo
         print(f"{file_id:7d} | {gid:8d} | {typ:5s} | {dims:>10s} | {size or 0:10d} | {status:10s} | {path}")
 
 
+# Rows fetched per round while writing the backup manifest
+_EXPORT_FETCH_ROWS = 10000
+
+
 def cmd_export_backup_list(db_manager: DatabaseManager, out_path: Path, include_undecided: bool = False, 
                           include_large: bool = False, include_originals: bool = False, as_json: bool = False):
     """Export backup manifest CSV with enhanced filtering options."""
@@ -340,23 +424,30 @@ def cmd_export_backup_list(db_manager: DatabaseManager, out_path: Path, include_
             ORDER BY is_original DESC, path_on_drive
         """
         
-        rows = conn.execute(query).fetchall()
+        cursor = conn.execute(query)
 
-    ensure_dir(out_path.parent)
-    
-    with out_path.open('w', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        writer.writerow(["file_id", "path_on_drive", "central_path", "size_bytes", "type", "review_status", "is_original"])
-        writer.writerows(rows)
+        ensure_dir(out_path.parent)
+        
+        # Rows go to the CSV a chunk at a time, so only one chunk is in memory
+        records_exported = original_count = 0
+        with out_path.open('w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(["file_id", "path_on_drive", "central_path", "size_bytes", "type", "review_status", "is_original"])
+            while True:
+                rows = cursor.fetchmany(_EXPORT_FETCH_ROWS)
+                if not rows:
+                    break
+                writer.writerows(rows)
+                records_exported += len(rows)
+                # Count originals vs regular files for reporting
+                original_count += sum(1 for row in rows if row[6])  # is_original column
     
-    # Count originals vs regular files for reporting
-    original_count = sum(1 for row in rows if row[6])  # is_original column
-    regular_count = len(rows) - original_count
+    regular_count = records_exported - original_count
     
     if as_json:
         return success("export-backup-list", {
             "output_file": str(out_path),
-            "records_exported": len(rows),
+            "records_exported": records_exported,
             "originals_count": original_count,
             "regular_files_count": regular_count,
             "include_undecided": include_undecided,
@@ -369,7 +460,7 @@ def cmd_export_backup_list(db_manager: DatabaseManager, out_path: Path, include_
             }
         })
     else:
-        print(f"Exported {len(rows)} records to {out_path}")
+        print(f"Exported {records_exported} records to {out_path}")
         if include_originals and original_count > 0:
             print(f"  - Included {original_count} originals (even if undecided)")
         if regular_count > 0:
@@ -36,10 +36,24 @@ def cmd_show_stats(
     logger = logging.getLogger(__name__)
 
     with db_manager.get_connection() as conn:
-        # Basic counts
-        file_count = conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
-        group_count = conn.execute("SELECT COUNT(*) FROM groups").fetchone()[0]
-        drive_count = conn.execute("SELECT COUNT(*) FROM drives").fetchone()[0]
+        # Basic counts and size statistics in one statement
+        (file_count, group_count, drive_count,
+         total_bytes, avg_bytes, large_files) = conn.execute(
+            """
+            SELECT
+                COUNT(*) AS total_files,
+                (SELECT COUNT(*) FROM groups) AS group_count,
+                (SELECT COUNT(*) FROM drives) AS drive_count,
+                SUM(size_bytes) AS total_bytes,
+                AVG(size_bytes) AS avg_bytes,
+                SUM(CASE WHEN is_large=1 THEN 1 ELSE 0 END) AS large_files
+            FROM files
+            """
+        ).fetchone()
+        total_files = file_count or 0
+        total_bytes = total_bytes or 0
+        avg_bytes = avg_bytes or 0
+        large_files = large_files or 0
 
         # File status breakdown
         status_rows = conn.execute(
@@ -51,22 +65,6 @@ def cmd_show_stats(
         ).fetchall()
         status_counts = {row[0] if row[0] is not None else "unknown": row[1] for row in status_rows}
 
-        # Size statistics
-        size_stats = conn.execute(
-            """
-            SELECT
-                COUNT(*) AS total_files,
-                SUM(size_bytes) AS total_bytes,
-                AVG(size_bytes) AS avg_bytes,
-                SUM(CASE WHEN is_large=1 THEN 1 ELSE 0 END) AS large_files
-            FROM files
-            """
-        ).fetchone()
-        total_files = size_stats[0] or 0
-        total_bytes = size_stats[1] or 0
-        avg_bytes = size_stats[2] or 0
-        large_files = size_stats[3] or 0
-
         results: Dict[str, Any] = {
             "counts": {
                 "files": int(file_count or 0),
@@ -91,28 +89,29 @@ def cmd_show_stats(
             type_counts = {row[0] if row[0] is not None else "unknown": row[1] for row in type_rows}
             results["types"] = type_counts
 
-        drive_rows = conn.execute(
-            """
-            SELECT
-                d.label,
-                d.mount_path AS mount_path,
-                COUNT(f.file_id) AS file_count,
-                COALESCE(SUM(f.size_bytes), 0) AS total_bytes
-            FROM drives d
-            LEFT JOIN files f ON f.drive_id = d.drive_id
-            GROUP BY d.drive_id
-            ORDER BY file_count DESC
-            """
-        ).fetchall()
+            # Per-drive totals walk every file again; plain `stats` never shows them
+            drive_rows = conn.execute(
+                """
+                SELECT
+                    d.label,
+                    d.mount_path AS mount_path,
+                    COUNT(f.file_id) AS file_count,
+                    COALESCE(SUM(f.size_bytes), 0) AS total_bytes
+                FROM drives d
+                LEFT JOIN files f ON f.drive_id = d.drive_id
+                GROUP BY d.drive_id
+                ORDER BY file_count DESC
+                """
+            ).fetchall()
 
-        results["drives"] = []
-        for (label, mount_path, count, bytes_total) in drive_rows:
-            results["drives"].append({
-                "label": label,
-                "mount_path": mount_path,
-                "file_count": int(count or 0),
-                "total_bytes": int(bytes_total or 0),
-            })
+            results["drives"] = []
+            for (label, mount_path, count, bytes_total) in drive_rows:
+                results["drives"].append({
+                    "label": label,
+                    "mount_path": mount_path,
+                    "file_count": int(count or 0),
+                    "total_bytes": int(bytes_total or 0),
+                })
 
     # Output
     if as_json:
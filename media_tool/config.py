@@ -5,6 +5,7 @@
 Global configuration and constants for the Media Consolidation Tool.
 """
 
+import os
 from pathlib import Path
 from typing import Set
 
@@ -27,6 +28,15 @@ DEFAULT_SMALL_FILE_BYTES = 1 * 1024  # 1KB
 DEFAULT_LARGE_FILE_BYTES = 500 * 1024 * 1024  # 500MB
 DEFAULT_MAX_PHASH_PIXELS = 24_000_000
 
+# SQLite memory-mapped I/O per connection (reads skip the pager's copy);
+# MEDIA_TOOL_MMAP_BYTES=0 turns it off
+DEFAULT_DB_MMAP_BYTES = 256 * 1024 * 1024
+try:
+    DB_MMAP_BYTES = max(0, int(os.environ.get("MEDIA_TOOL_MMAP_BYTES", DEFAULT_DB_MMAP_BYTES)))
+except ValueError:
+    # A malformed override must not stop the tool from importing
+    DB_MMAP_BYTES = DEFAULT_DB_MMAP_BYTES
+
 # Processing defaults
 DEFAULT_WORKERS = 6
 DEFAULT_IO_WORKERS = 2
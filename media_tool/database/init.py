@@ -3,6 +3,13 @@ import sqlite3
 
 SCHEMA_FILE = Path(__file__).with_name("schema.sql")
 
+# Indexes added to schema.sql after release; created on databases that predate them
+_ADDED_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_files_group_status ON files(group_id, review_status)",
+    "CREATE INDEX IF NOT EXISTS idx_files_status_created ON files(review_status, created_at DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_files_path_nocase ON files(path_on_drive COLLATE NOCASE)",
+)
+
 def init_db_if_needed(db_path: Path):
     db_path = Path(db_path)
     create_new = not db_path.exists()
@@ -15,5 +22,13 @@ def init_db_if_needed(db_path: Path):
             with open(SCHEMA_FILE, "r", encoding="utf-8") as f:
                 conn.executescript(f.read())
             conn.commit()
+        else:
+            try:
+                for stmt in _ADDED_INDEXES:
+                    conn.execute(stmt)
+                conn.commit()
+            except sqlite3.OperationalError:
+                # Read-only database: queries still work, just without the index
+                pass
     finally:
         conn.close()
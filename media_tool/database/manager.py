@@ -2,6 +2,7 @@
 import sqlite3
 from pathlib import Path
 
+from ..config import DB_MMAP_BYTES
 from ..models.file_record import FileRecord
 from .init import init_db_if_needed
 from typing import List
@@ -18,6 +19,8 @@ class DatabaseManager:
         self.conn.execute("PRAGMA foreign_keys=ON;")
         self.conn.execute("PRAGMA journal_mode=WAL;")
         self.conn.execute("PRAGMA synchronous=NORMAL;")
+        self.conn.execute(f"PRAGMA mmap_size={int(DB_MMAP_BYTES)};")
+        self.conn.execute("PRAGMA temp_store=MEMORY;")
 
     def get_connection(self):
         """Backward-compatible accessor used throughout the codebase."""
@@ -1,7 +1,37 @@
 # media_tool/jsonio.py
 from __future__ import annotations
-import json, logging, sys
-from typing import Any, Dict, Optional
+import json, logging, sys, threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+# Per-thread stack of payload lists; see capture()
+_sinks = threading.local()
+
+@contextmanager
+def capture() -> Iterator[List[Dict[str, Any]]]:
+    """
+    Collect the payloads passed to success()/error() in this thread into a
+    list instead of printing them. In-process callers (the web UI, the batch
+    command) get dicts back without a json.dumps/json.loads round trip.
+    """
+    stack = getattr(_sinks, "stack", None)
+    if stack is None:
+        stack = _sinks.stack = []
+    payloads: List[Dict[str, Any]] = []
+    stack.append(payloads)
+    try:
+        yield payloads
+    finally:
+        stack.pop()
+
+def _emit(payload: Dict[str, Any]) -> None:
+    stack = getattr(_sinks, "stack", None)
+    if stack:
+        stack[-1].append(payload)
+        return
+    # Always print JSON to stdout, logs go to stderr
+    print(json.dumps(payload, ensure_ascii=False), file=sys.stdout)
+    sys.stdout.flush()  # Ensure immediate output
 
 def enable_json_logging():
     """Send logs to stderr and suppress info noise when emitting JSON to stdout."""
@@ -15,16 +45,27 @@ def success(command: str, data: Dict[str, Any] | list | None = None,
     payload = {"result": "success", "command": command, "data": data if data is not None else {}}
     if meta:
         payload["meta"] = meta
-    # Always print JSON to stdout, logs go to stderr
-    print(json.dumps(payload, ensure_ascii=False), file=sys.stdout)
-    sys.stdout.flush()  # Ensure immediate output
+    _emit(payload)
     return code
 
 def error(command: str, message: str, debug: Optional[Dict[str, Any]] = None, code: int = 1) -> int:
     payload = {"result": "error", "command": command, "error": message}
     if debug:
         payload["debug"] = debug
-    # Always print JSON to stdout, logs go to stderr
-    print(json.dumps(payload, ensure_ascii=False), file=sys.stdout)
-    sys.stdout.flush()  # Ensure immediate output
-    return code
\ No newline at end of file
+    _emit(payload)
+    return code
+
+def stream_records(command: str, records: Iterable[Dict[str, Any]]) -> int:
+    """
+    Write records as NDJSON, one object per line as each is produced, so a
+    reader can handle the first without waiting for the rest. Under capture()
+    nobody reads stdout, so the records arrive as one success payload instead.
+    """
+    stack = getattr(_sinks, "stack", None)
+    if stack:
+        return success(command, {"items": list(records)})
+    out = sys.stdout
+    for record in records:
+        out.write(json.dumps(record, ensure_ascii=False) + "\n")
+    out.flush()
+    return 0
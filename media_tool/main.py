@@ -6,10 +6,17 @@ Main CLI entry point for the Media Consolidation & Review Tool.
 """
 
 import argparse
+import io
+import json
+import os
+import selectors
+import socket
 import sys
 import logging
+from contextlib import redirect_stdout
 from pathlib import Path
 
+from . import config
 from .config import REVIEW_STATUSES, DEFAULT_PHASH_THRESHOLD, LARGE_FILE_BYTES
 from .database.manager import DatabaseManager
 from .database.init import init_db_if_needed
@@ -20,6 +27,7 @@ from .commands.review import (
     cmd_bulk_mark, cmd_review_queue, cmd_export_backup_list
 )
 from .commands.stats import cmd_show_stats
+from .jsonio import capture, error
 
 
 def setup_logging(verbose: bool, json_mode: bool = False):
@@ -85,6 +93,7 @@ def create_parser():
     _add_correction_parsers(subparsers)
     _add_review_parsers(subparsers)
     _add_stats_parser(subparsers)
+    _add_serve_parser(subparsers)
     
     return parser
 
@@ -187,6 +196,8 @@ def _add_review_parsers(subparsers):
     bulk_mark_parser = subparsers.add_parser("bulk-mark", help="Bulk mark by path pattern")
     bulk_mark_parser.add_argument("--path-like", required=True,
                                 help="Path substring to match")
+    bulk_mark_parser.add_argument("--regex", action="store_true",
+                                help="Treat --path-like as a regular expression instead of a LIKE pattern")
     bulk_mark_parser.add_argument("--status", choices=list(REVIEW_STATUSES), required=True,
                                 help="Review status")
     bulk_mark_parser.add_argument("--limit", type=int, default=100,
@@ -199,6 +210,8 @@ def _add_review_parsers(subparsers):
     queue_parser.add_argument("--limit", type=int, default=100,
                             help="Maximum items to show (default: 100)")
     queue_parser.add_argument("--json", action="store_true", help="Output as JSON")
+    queue_parser.add_argument("--stream", action="store_true",
+                            help="With --json, write one JSON item per line as it is read")
     
     export_parser = subparsers.add_parser("export-backup-list", help="Export backup manifest")
     export_parser.add_argument("--out", required=True,
@@ -221,13 +234,148 @@ def _add_stats_parser(subparsers):
                             help="Output statistics as JSON")
 
 
+def _add_serve_parser(subparsers):
+    """Add serve command parser."""
+    serve_parser = subparsers.add_parser("serve",
+                                       help="Answer JSON command lines from stdin until EOF (for long-lived callers)")
+    serve_parser.add_argument("--socket",
+                            help="Listen on this Unix socket path instead of stdin/stdout")
+    serve_parser.add_argument("--idle-timeout", type=float, default=600,
+                            help="With --socket, exit after this many idle seconds (default: 600)")
+
+
+# Commands that must not run inside the serve loop: scans are long-running
+# and configure process-wide state, and serve does not nest.
+SERVE_EXCLUDED_COMMANDS = {"scan", "serve"}
+
+
+def dispatch_command(parser, args, db_path, db_manager):
+    """Execute one parsed command and return its exit code."""
+    # Apply global configuration from CLI args
+    if args.command == "scan":
+        if hasattr(args, 'phash_threshold'):
+            config.PHASH_THRESHOLD = args.phash_threshold
+            logging.debug("Set PHASH_THRESHOLD = %d", args.phash_threshold)
+        if hasattr(args, 'large_threshold_mb'):
+            config.LARGE_FILE_BYTES = args.large_threshold_mb * 1024 * 1024
+            logging.debug("Set LARGE_FILE_BYTES = %d", config.LARGE_FILE_BYTES)
+    
+    # Execute commands
+    if args.command == "scan":
+        logging.info("Starting scan command.")
+        
+        # Validate that source path is absolute
+        source_path = Path(args.source)
+        if not source_path.is_absolute():
+            error_msg = f"Source path must be absolute, got: {args.source}"
+            if getattr(args, 'json', False):
+                return error(args.command, error_msg, code=1)
+            else:
+                logging.error(error_msg)
+                print(f"Error: {error_msg}", file=sys.stderr)
+                print(f"Use: media-tool --db {args.db} scan --source \"$(pwd)/{args.source}\" --central {args.central}", file=sys.stderr)
+                sys.exit(1)
+        
+        # Validate that central path exists or can be created
+        central_path = Path(args.central)
+        if not central_path.is_absolute():
+            logging.warning("Central path is relative: %s. Consider using an absolute path.", args.central)
+        
+        scanner = ScanCommand(db_path, central_path)
+        
+        scanner.execute(
+            source=Path(args.source),
+            wsl_mode=args.wsl_hfs_mode,
+            drive_label=args.drive_label,
+            drive_id_hint=args.drive_id,
+            hash_large=args.hash_large,
+            workers=args.workers,
+            io_workers=args.io_workers,
+            phash_threshold=args.phash_threshold,
+            skip_discovery=args.skip_discovery,
+            max_phash_pixels=args.max_phash_pixels,
+            chunk_size=args.chunk_size,
+            resume_scan_id=args.resume_scan_id,
+            auto_checkpoint=not args.no_checkpoints
+        )
+        logging.info("Scan completed.")
+    
+    elif args.command == "list-checkpoints":
+        logging.info("Listing checkpoints...")
+        return cmd_list_checkpoints(db_manager, args.source, getattr(args, 'json', False))
+    
+    elif args.command == "checkpoint-info":
+        logging.info("Fetching checkpoint info for scan_id=%s", args.scan_id)
+        return cmd_checkpoint_info(db_manager, args.scan_id, getattr(args, 'json', False))
+    
+    elif args.command == "cleanup-checkpoints":
+        logging.info("Cleaning up checkpoints (days=%d, scan_id=%s)", args.days, getattr(args, 'scan_id', None))
+        return cmd_cleanup_checkpoints(db_manager, args.days, getattr(args, 'scan_id', None), getattr(args, 'json', False))
+    
+    elif args.command == "make-original":
+        logging.info("Making file %d original", args.file_id)
+        with db_manager.get_connection() as conn:
+            row = conn.execute("SELECT central_path FROM files WHERE central_path IS NOT NULL LIMIT 1").fetchone()
+            central = Path(row[0]).parents[1] if row else Path.cwd()
+        return cmd_make_original(db_manager, central, args.file_id, getattr(args, 'json', False))
+    
+    elif args.command == "promote":
+        logging.info("Promoting file %d to group original", args.file_id)
+        with db_manager.get_connection() as conn:
+            row = conn.execute("SELECT central_path FROM files WHERE central_path IS NOT NULL LIMIT 1").fetchone()
+            central = Path(row[0]).parents[1] if row else Path.cwd()
+        return cmd_promote(db_manager, central, args.file_id, getattr(args, 'json', False))
+    
+    elif args.command == "move-to-group":
+        logging.info("Moving file %d to group %d", args.file_id, args.group_id)
+        with db_manager.get_connection() as conn:
+            row = conn.execute("SELECT central_path FROM files WHERE central_path IS NOT NULL LIMIT 1").fetchone()
+            central = Path(row[0]).parents[1] if row else Path.cwd()
+        return cmd_move_to_group(db_manager, central, args.file_id, args.group_id, getattr(args, 'json', False))
+    
+    elif args.command == "mark":
+        logging.info("Marking file %d as %s", args.file_id, args.status)
+        return cmd_mark(db_manager, args.file_id, args.status, getattr(args, 'note', None), getattr(args, 'json', False))
+    
+    elif args.command == "mark-group":
+        logging.info("Marking group %d as %s", args.group_id, args.status)
+        return cmd_mark_group(db_manager, args.group_id, args.status, getattr(args, 'note', None), getattr(args, 'json', False))
+    
+    elif args.command == "bulk-mark":
+        logging.info("Bulk marking files where path %s '%s' as %s",
+                     "matches" if args.regex else "LIKE", args.path_like, args.status)
+        return cmd_bulk_mark(db_manager, args.path_like, args.status, 
+                           getattr(args, 'limit', 100), getattr(args, 'preview', False), getattr(args, 'json', False),
+                           getattr(args, 'regex', False))
+    
+    elif args.command == "review-queue":
+        logging.info("Showing review queue (limit=%d)", args.limit)
+        return cmd_review_queue(db_manager, args.limit, getattr(args, 'json', False),
+                                getattr(args, 'stream', False))
+    
+    elif args.command == "export-backup-list":
+        logging.info("Exporting backup list to %s", args.out)
+        return cmd_export_backup_list(db_manager, Path(args.out), 
+                                     args.include_undecided, args.include_large, 
+                                     getattr(args, 'include_originals', False), getattr(args, 'json', False))
+    
+    elif args.command == "stats":
+        logging.info("Showing database stats (detailed=%s)", args.detailed)
+        return cmd_show_stats(db_manager, args.detailed, getattr(args, 'json', False))
+    
+    elif args.command == "serve":
+        logging.info("Serving commands on %s", args.socket or "stdin")
+        return _run_serve(parser, args, db_path, db_manager)
+
+
 def main():
     """Main CLI entry point."""
     parser = create_parser()
     args = parser.parse_args()
     
-    # Detect JSON mode from any command that has --json flag
-    json_mode = getattr(args, 'json', False)
+    # Detect JSON mode from any command that has --json flag; serve's
+    # stdout carries replies, so its logs must go to stderr as well
+    json_mode = getattr(args, 'json', False) or args.command == "serve"
     
     # Setup logging based on verbosity and JSON mode
     setup_logging(args.verbose, json_mode)
@@ -242,120 +390,10 @@ def main():
     logging.debug("Database manager initialized.")
     
     try:
-        # Apply global configuration from CLI args
-        if args.command == "scan":
-            import media_tool.config as config
-            if hasattr(args, 'phash_threshold'):
-                config.PHASH_THRESHOLD = args.phash_threshold
-                logging.debug("Set PHASH_THRESHOLD = %d", args.phash_threshold)
-            if hasattr(args, 'large_threshold_mb'):
-                config.LARGE_FILE_BYTES = args.large_threshold_mb * 1024 * 1024
-                logging.debug("Set LARGE_FILE_BYTES = %d", config.LARGE_FILE_BYTES)
-        
-        # Execute commands
-        if args.command == "scan":
-            logging.info("Starting scan command.")
-            
-            # Validate that source path is absolute
-            source_path = Path(args.source)
-            if not source_path.is_absolute():
-                error_msg = f"Source path must be absolute, got: {args.source}"
-                if getattr(args, 'json', False):
-                    from .jsonio import error
-                    return error(args.command, error_msg, code=1)
-                else:
-                    logging.error(error_msg)
-                    print(f"Error: {error_msg}", file=sys.stderr)
-                    print(f"Use: media-tool --db {args.db} scan --source \"$(pwd)/{args.source}\" --central {args.central}", file=sys.stderr)
-                    sys.exit(1)
-            
-            # Validate that central path exists or can be created
-            central_path = Path(args.central)
-            if not central_path.is_absolute():
-                logging.warning("Central path is relative: %s. Consider using an absolute path.", args.central)
-            
-            scanner = ScanCommand(db_path, central_path)
-            
-            scanner.execute(
-                source=Path(args.source),
-                wsl_mode=args.wsl_hfs_mode,
-                drive_label=args.drive_label,
-                drive_id_hint=args.drive_id,
-                hash_large=args.hash_large,
-                workers=args.workers,
-                io_workers=args.io_workers,
-                phash_threshold=args.phash_threshold,
-                skip_discovery=args.skip_discovery,
-                max_phash_pixels=args.max_phash_pixels,
-                chunk_size=args.chunk_size,
-                resume_scan_id=args.resume_scan_id,
-                auto_checkpoint=not args.no_checkpoints
-            )
-            logging.info("Scan completed.")
-        
-        elif args.command == "list-checkpoints":
-            logging.info("Listing checkpoints...")
-            return cmd_list_checkpoints(db_manager, args.source, getattr(args, 'json', False))
-        
-        elif args.command == "checkpoint-info":
-            logging.info("Fetching checkpoint info for scan_id=%s", args.scan_id)
-            return cmd_checkpoint_info(db_manager, args.scan_id, getattr(args, 'json', False))
-        
-        elif args.command == "cleanup-checkpoints":
-            logging.info("Cleaning up checkpoints (days=%d, scan_id=%s)", args.days, getattr(args, 'scan_id', None))
-            return cmd_cleanup_checkpoints(db_manager, args.days, getattr(args, 'scan_id', None), getattr(args, 'json', False))
-        
-        elif args.command == "make-original":
-            logging.info("Making file %d original", args.file_id)
-            with db_manager.get_connection() as conn:
-                row = conn.execute("SELECT central_path FROM files WHERE central_path IS NOT NULL LIMIT 1").fetchone()
-                central = Path(row[0]).parents[1] if row else Path.cwd()
-            return cmd_make_original(db_manager, central, args.file_id, getattr(args, 'json', False))
-        
-        elif args.command == "promote":
-            logging.info("Promoting file %d to group original", args.file_id)
-            with db_manager.get_connection() as conn:
-                row = conn.execute("SELECT central_path FROM files WHERE central_path IS NOT NULL LIMIT 1").fetchone()
-                central = Path(row[0]).parents[1] if row else Path.cwd()
-            return cmd_promote(db_manager, central, args.file_id, getattr(args, 'json', False))
-        
-        elif args.command == "move-to-group":
-            logging.info("Moving file %d to group %d", args.file_id, args.group_id)
-            with db_manager.get_connection() as conn:
-                row = conn.execute("SELECT central_path FROM files WHERE central_path IS NOT NULL LIMIT 1").fetchone()
-                central = Path(row[0]).parents[1] if row else Path.cwd()
-            return cmd_move_to_group(db_manager, central, args.file_id, args.group_id, getattr(args, 'json', False))
-        
-        elif args.command == "mark":
-            logging.info("Marking file %d as %s", args.file_id, args.status)
-            return cmd_mark(db_manager, args.file_id, args.status, getattr(args, 'note', None), getattr(args, 'json', False))
-        
-        elif args.command == "mark-group":
-            logging.info("Marking group %d as %s", args.group_id, args.status)
-            return cmd_mark_group(db_manager, args.group_id, args.status, getattr(args, 'note', None), getattr(args, 'json', False))
-        
-        elif args.command == "bulk-mark":
-            logging.info("Bulk marking files where path LIKE '%s' as %s", args.path_like, args.status)
-            return cmd_bulk_mark(db_manager, args.path_like, args.status, 
-                               getattr(args, 'limit', 100), getattr(args, 'preview', False), getattr(args, 'json', False))
-        
-        elif args.command == "review-queue":
-            logging.info("Showing review queue (limit=%d)", args.limit)
-            return cmd_review_queue(db_manager, args.limit, getattr(args, 'json', False))
-        
-        elif args.command == "export-backup-list":
-            logging.info("Exporting backup list to %s", args.out)
-            return cmd_export_backup_list(db_manager, Path(args.out), 
-                                         args.include_undecided, args.include_large, 
-                                         getattr(args, 'include_originals', False), getattr(args, 'json', False))
-        
-        elif args.command == "stats":
-            logging.info("Showing database stats (detailed=%s)", args.detailed)
-            return cmd_show_stats(db_manager, args.detailed, getattr(args, 'json', False))
+        return dispatch_command(parser, args, db_path, db_manager)
     
     except KeyboardInterrupt:
         if getattr(args, 'json', False):
-            from .jsonio import error
             return error(args.command, "Operation interrupted by user", code=130)
         else:
             logging.warning("Operation interrupted by user.")
@@ -364,13 +402,135 @@ def main():
             sys.exit(130)
     except Exception as e:
         if getattr(args, 'json', False):
-            from .jsonio import error
             debug_info = {"exception_type": type(e).__name__} if args.verbose else None
             return error(args.command, str(e), debug=debug_info, code=1)
         else:
             logging.error("Error occurred: %s", e, exc_info=args.verbose)
             sys.exit(1)
+    finally:
+        # Long-lived callers (the web UI) invoke main() repeatedly in-process
+        db_manager.close()
+
+
+def _run_op(parser, args, op, db_path, db_manager):
+    """Run one argument list in JSON mode and return its payload dict."""
+    op = [str(a) for a in op]
+    if op[0] in SERVE_EXCLUDED_COMMANDS:
+        return {"result": "error", "command": op[0],
+                "error": f"Command not allowed in {args.command}: {op[0]}"}
+
+    # Payloads are collected as dicts; anything else an op prints is dropped
+    with capture() as payloads, redirect_stdout(io.StringIO()):
+        try:
+            op_args = parser.parse_args(op if "--json" in op else [*op, "--json"])
+            op_args.verbose = args.verbose
+            dispatch_command(parser, op_args, db_path, db_manager)
+        except SystemExit:
+            # argparse usage errors; the message already went to stderr
+            pass
+        except Exception as e:
+            error(op[0], str(e), code=1)
+
+    return payloads[-1] if payloads else {"result": "error", "command": op[0], "error": "Invalid arguments"}
+
+
+def _run_serve(parser, args, db_path, db_manager):
+    """
+    Answer requests from a long-lived caller: each stdin line is a JSON
+    argument list such as ["stats", "--detailed"], and each gets exactly one
+    JSON payload line back on stdout. Runs until stdin is closed, so the
+    interpreter, imports and database manager stay warm between commands.
+    """
+    if args.socket:
+        return _serve_socket(parser, args, db_path, db_manager)
+
+    out = sys.stdout
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        out.write(_serve_reply(parser, args, line, db_path, db_manager))
+        out.flush()
+    return 0
+
+
+def _serve_reply(parser, args, line, db_path, db_manager):
+    """Answer one request line with one JSON payload line."""
+    try:
+        op = json.loads(line)
+        if not (isinstance(op, list) and op):
+            raise ValueError("expected a non-empty JSON argument list")
+    except ValueError as e:  # includes json.JSONDecodeError
+        payload = {"result": "error", "command": args.command, "error": f"Invalid request: {e}"}
+    else:
+        payload = _run_op(parser, args, op, db_path, db_manager)
+    return json.dumps(payload, ensure_ascii=False) + "\n"
+
+
+def _serve_socket(parser, args, db_path, db_manager):
+    """
+    Same line protocol as serve on stdin, but as a daemon on a Unix socket
+    that any number of clients can connect to and reuse. Requests are
+    answered one at a time in arrival order; the daemon removes its socket
+    and exits once no request has arrived for --idle-timeout seconds.
+    """
+    path = args.socket
+    if os.path.exists(path):
+        # Refuse to steal a live daemon's socket; a stale file is replaced
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(path)
+        except OSError:
+            os.unlink(path)
+        else:
+            probe.close()
+            return error(args.command, f"Another server is listening on {path}", code=1)
+
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(path)
+    listener.listen()
+    selector = selectors.DefaultSelector()
+    selector.register(listener, selectors.EVENT_READ)
+    pending = {}  # connection -> bytes received after its last full line
+
+    try:
+        while True:
+            events = selector.select(timeout=args.idle_timeout)
+            if not events:
+                logging.info("Idle for %ss, shutting down", args.idle_timeout)
+                return 0
+            for key, _ in events:
+                if key.fileobj is listener:
+                    conn, _ = listener.accept()
+                    selector.register(conn, selectors.EVENT_READ)
+                    pending[conn] = b""
+                    continue
+
+                conn = key.fileobj
+                try:
+                    data = conn.recv(1 << 16)
+                except OSError:
+                    data = b""
+                if not data:
+                    selector.unregister(conn)
+                    conn.close()
+                    del pending[conn]
+                    continue
+
+                *lines, pending[conn] = (pending[conn] + data).split(b"\n")
+                for line in lines:
+                    if not line.strip():
+                        continue
+                    reply = _serve_reply(parser, args, line, db_path, db_manager)
+                    try:
+                        conn.sendall(reply.encode("utf-8"))
+                    except OSError:
+                        break  # client went away; its EOF is handled on the next select
+    finally:
+        for conn in pending:
+            conn.close()
+        listener.close()
+        os.unlink(path)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
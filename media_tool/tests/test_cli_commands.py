@@ -12,6 +12,10 @@ from pathlib import Path
 from unittest.mock import patch, MagicMock
 import sys
 import os
+import shutil
+import socket
+import subprocess
+import time
 
 # Add the media_tool package to Python path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -229,6 +233,16 @@ class TestReviewCommands(TestDatabaseFixture):
             group_files = conn.execute("SELECT review_status FROM files WHERE group_id=1").fetchall()
             assert all(row[0] == "keep" for row in group_files)
     
+    def test_bulk_mark_skips_unchanged_rows(self, test_db, capsys):
+        """Test that re-applying a bulk mark rewrites no rows."""
+        cmd_bulk_mark(test_db, path_like="%photos%", new_status="keep", as_json=True)
+        first = json.loads(capsys.readouterr().out)["data"]
+        cmd_bulk_mark(test_db, path_like="%photos%", new_status="keep", as_json=True)
+        second = json.loads(capsys.readouterr().out)["data"]
+        
+        assert first["files_updated"] > 0
+        assert second["files_updated"] == 0
+    
     def test_mark_nonexistent_group(self, test_db):
         """Test marking non-existent group."""
         result = cmd_mark_group(test_db, group_id=999, new_status="keep", as_json=True)
@@ -260,11 +274,46 @@ class TestReviewCommands(TestDatabaseFixture):
             after_count = conn.execute("SELECT COUNT(*) FROM files WHERE path_on_drive LIKE '%photos%' AND review_status='keep'").fetchone()[0]
             assert after_count == before_count
     
+    def test_bulk_mark_regex(self, test_db):
+        """Test bulk mark with a regular expression pattern."""
+        with test_db.get_connection() as conn:
+            expected = [r[0] for r in conn.execute("SELECT file_id FROM files WHERE path_on_drive LIKE '%.jpg'")]
+        
+        result = cmd_bulk_mark(test_db, path_like=r"\.jpg$", new_status="not_needed",
+                              preview=False, as_json=True, regex=True)
+        assert result == 0
+        
+        with test_db.get_connection() as conn:
+            marked = [r[0] for r in conn.execute("SELECT file_id FROM files WHERE review_status='not_needed' AND path_on_drive LIKE '%.jpg'")]
+        assert expected and sorted(marked) == sorted(expected)
+    
+    def test_bulk_mark_regex_stays_case_sensitive(self, test_db, capsys):
+        """Test that the LIKE prefilter on a regex's literal prefix does not widen matches."""
+        result = cmd_bulk_mark(test_db, path_like="^/PHOTOS/", new_status="keep",
+                              preview=True, as_json=True, regex=True)
+        assert result == 0
+        assert json.loads(capsys.readouterr().out)["data"]["total_matches"] == 0
+    
+    def test_bulk_mark_invalid_regex(self, test_db):
+        """Test that an invalid regex is reported instead of raising."""
+        result = cmd_bulk_mark(test_db, path_like="(", new_status="keep",
+                              preview=True, as_json=True, regex=True)
+        assert result == 1
+    
     def test_review_queue_with_items(self, test_db):
         """Test review queue when items exist."""
         result = cmd_review_queue(test_db, limit=5, as_json=True)
         assert result == 0
     
+    def test_review_queue_stream(self, test_db, capsys):
+        """Test review queue streaming one JSON item per line."""
+        result = cmd_review_queue(test_db, limit=5, as_json=True, stream=True)
+        assert result == 0
+        
+        items = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert 0 < len(items) <= 5
+        assert all(item["review_status"] == "undecided" for item in items)
+    
     def test_review_queue_empty(self, test_db):
         """Test review queue when no undecided items exist."""
         # Mark all files as decided
@@ -342,6 +391,199 @@ class TestStatsCommands(TestDatabaseFixture):
             assert any("Database Statistics" in msg for msg in logged_messages)
 
 
+class TestServeCommand(TestDatabaseFixture):
+    """Test answering command lines through the serve subcommand."""
+    
+    def test_serve_answers_each_line(self, test_db, capsys):
+        """Test that every request line gets one JSON reply line, in order."""
+        from media_tool.main import main
+        import io
+        requests = '["mark", "--file-id", "1", "--status", "keep"]\nnot json\n["scan"]\n["stats"]\n'
+        argv = ["media-tool", "--db", str(test_db.db_path), "serve"]
+        with patch.object(sys, 'argv', argv), patch.object(sys, 'stdin', io.StringIO(requests)):
+            result = main()
+        
+        replies = [json.loads(line) for line in capsys.readouterr().out.strip().splitlines()]
+        assert result == 0
+        assert [r["result"] for r in replies] == ["success", "error", "error", "success"]
+        assert replies[0]["data"]["new_status"] == "keep"
+        assert replies[3]["command"] == "stats"
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix sockets")
+class TestServeSocket(TestDatabaseFixture):
+    """Test the serve --socket daemon and the web UI's client for it."""
+    
+    @pytest.fixture
+    def sock_dir(self):
+        """A short directory for socket files (AF_UNIX paths are length-limited)."""
+        path = tempfile.mkdtemp(prefix="mcrt", dir="/tmp")
+        yield Path(path)
+        shutil.rmtree(path, ignore_errors=True)
+    
+    @staticmethod
+    def _env():
+        repo_root = str(Path(__file__).resolve().parents[2])
+        return {**os.environ, "PYTHONPATH": os.pathsep.join([repo_root, os.environ.get("PYTHONPATH", "")])}
+    
+    def _start_daemon(self, test_db, sock_path, idle_timeout=30):
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "media_tool", "--db", str(test_db.db_path),
+             "serve", "--socket", str(sock_path), "--idle-timeout", str(idle_timeout)],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, env=self._env())
+        deadline = time.monotonic() + 10
+        while True:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                try:
+                    probe.connect(str(sock_path))
+                    return proc
+                except OSError:
+                    pass
+            assert proc.poll() is None and time.monotonic() < deadline, "daemon did not start"
+            time.sleep(0.02)
+    
+    @staticmethod
+    def _stop(proc):
+        if proc.poll() is None:
+            proc.kill()
+        proc.wait(timeout=10)
+        proc.stdout.close()
+    
+    @staticmethod
+    def _ask(sock_file, argv):
+        sock_file.write(json.dumps(argv).encode("utf-8") + b"\n")
+        sock_file.flush()
+        return json.loads(sock_file.readline())
+    
+    def test_daemon_answers_several_clients(self, test_db, sock_dir):
+        """Test that each connection gets one reply per request line, in order."""
+        sock_path = sock_dir / "d.sock"
+        proc = self._start_daemon(test_db, sock_path)
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as first:
+                first.connect(str(sock_path))
+                first_file = first.makefile("rwb")
+                assert self._ask(first_file, ["mark", "--file-id", "1", "--status", "keep"])["result"] == "success"
+                assert self._ask(first_file, ["scan"])["result"] == "error"
+                
+                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as second:
+                    second.connect(str(sock_path))
+                    reply = self._ask(second.makefile("rwb"), ["stats"])
+                assert reply["command"] == "stats"
+                assert reply["data"]["review_status"]["keep"] >= 1
+        finally:
+            self._stop(proc)
+    
+    def test_daemon_replaces_stale_socket(self, test_db, sock_dir):
+        """Test that a socket file nobody listens on is taken over."""
+        sock_path = sock_dir / "d.sock"
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(str(sock_path))
+        stale.close()  # the file stays behind with no listener
+        
+        proc = self._start_daemon(test_db, sock_path)
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+                client.connect(str(sock_path))
+                assert self._ask(client.makefile("rwb"), ["stats"])["result"] == "success"
+        finally:
+            self._stop(proc)
+    
+    def test_daemon_refuses_live_socket(self, test_db, sock_dir):
+        """Test that a second daemon does not steal a live daemon's socket."""
+        sock_path = sock_dir / "d.sock"
+        proc = self._start_daemon(test_db, sock_path)
+        try:
+            second = subprocess.run(
+                [sys.executable, "-m", "media_tool", "--db", str(test_db.db_path),
+                 "serve", "--socket", str(sock_path)],
+                capture_output=True, env=self._env(), timeout=30)
+            assert second.returncode == 1
+            assert proc.poll() is None and sock_path.exists()
+        finally:
+            self._stop(proc)
+    
+    def test_daemon_exits_when_idle(self, test_db, sock_dir):
+        """Test that the daemon removes its socket and exits after --idle-timeout."""
+        sock_path = sock_dir / "d.sock"
+        proc = self._start_daemon(test_db, sock_path, idle_timeout=0.2)
+        try:
+            assert proc.wait(timeout=10) == 0
+            assert not sock_path.exists()
+        finally:
+            self._stop(proc)
+    
+    def _socket_client(self, db_path, sock_base, monkeypatch):
+        from media_ui.cli_interface import MediaToolCLI
+        monkeypatch.setenv("MEDIA_CLI_SOCKET", str(sock_base))
+        monkeypatch.setenv("PYTHONPATH", self._env()["PYTHONPATH"])
+        cli = MediaToolCLI(db_path=str(db_path))
+        cli._main = None  # force the daemon transport instead of in-process calls
+        return cli
+    
+    def test_client_socket_path_is_per_database(self, test_db, sock_dir, monkeypatch):
+        """Test that the socket name is the base plus a hash of the resolved DB path."""
+        import hashlib
+        other_db = create_test_database()
+        try:
+            cli = self._socket_client(test_db.db_path, sock_dir / "ui.sock", monkeypatch)
+            other = self._socket_client(other_db, sock_dir / "ui.sock", monkeypatch)
+            digest = hashlib.sha1(os.path.realpath(test_db.db_path).encode("utf-8")).hexdigest()[:12]
+            assert cli._socket_path == f"{sock_dir / 'ui.sock'}.{digest}"
+            assert other._socket_path != cli._socket_path
+        finally:
+            other_db.unlink(missing_ok=True)
+            shutil.rmtree(other_db.parent, ignore_errors=True)
+    
+    def test_client_restarts_daemon_after_it_dies(self, test_db, sock_dir, monkeypatch):
+        """Test that the client starts the daemon, and reconnects to a new one if it exits."""
+        cli = self._socket_client(test_db.db_path, sock_dir / "ui.sock", monkeypatch)
+        try:
+            assert cli.run_json_command("stats")["result"] == "success"
+            first = cli._daemon
+            assert first is not None and os.path.exists(cli._socket_path)
+            
+            first.kill()
+            first.wait(timeout=10)
+            assert cli.run_json_command("stats")["result"] == "success"
+            assert cli._daemon is not first and cli._use_server
+        finally:
+            cli.close()
+            for proc in (first, cli._daemon):
+                if proc is not None and proc.poll() is None:
+                    proc.kill()
+                    proc.wait(timeout=10)
+    
+    def test_client_falls_back_without_daemon(self, test_db, sock_dir, monkeypatch):
+        """Test that an unusable socket path falls back to a process per command."""
+        cli = self._socket_client(test_db.db_path, sock_dir / "missing" / "ui.sock", monkeypatch)
+        try:
+            result = cli.run_json_command("stats")
+            assert result["result"] == "success"
+            assert cli._use_server is False
+        finally:
+            cli.close()
+            if cli._daemon is not None and cli._daemon.poll() is None:
+                cli._daemon.kill()
+                cli._daemon.wait(timeout=10)
+
+
+class TestJsonCapture(TestDatabaseFixture):
+    """Test collecting JSON payloads in-process instead of printing them."""
+    
+    def test_capture_collects_payloads(self, test_db, capsys):
+        """Test that captured payloads are returned as dicts and not printed."""
+        from media_tool.jsonio import capture
+        
+        with capture() as payloads:
+            result = cmd_mark(test_db, file_id=1, new_status="keep", as_json=True)
+        
+        assert result == 0
+        assert capsys.readouterr().out == ""
+        assert payloads[-1]["result"] == "success"
+        assert payloads[-1]["data"]["new_status"] == "keep"
+
+
 class TestErrorHandling(TestDatabaseFixture):
     """Test error handling across commands."""
     
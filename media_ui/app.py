@@ -5,13 +5,16 @@ JSON-driven UI with separated templates and full functionality.
 """
 
 import os
+import sys
+import threading
 import traceback
 import io
+import json
 from pathlib import Path
 from flask import Flask, request, jsonify, send_file, render_template, abort, Response
 
 app = Flask(__name__)
-cli = None  # will be set in main()
+cli = None  # will be set in create_app()
 
 # Import PIL for placeholder image generation
 try:
@@ -28,6 +31,34 @@ app = Flask(__name__,
            static_folder='static')
 app.secret_key = os.environ.get('SECRET_KEY', 'media-tool-ui-secret')
 
+TIFF_EXTENSIONS = ('.tiff', '.tif')
+
+# orjson is optional; when installed the JSON API responses are serialized
+# with it, several times faster than jsonify's stdlib encoder
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def json_response(obj, status=200):
+    """Build a JSON Response from obj (orjson when available, else jsonify)."""
+    if orjson is None:
+        return jsonify(obj), status
+    return Response(orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS),
+                    status=status, mimetype='application/json')
+
+
+def ndjson_line(obj):
+    """One NDJSON line for obj."""
+    if orjson is None:
+        return json.dumps(obj) + "\n"
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+
+
+# Opt-in per-request profiling (MCRT_PROFILE=1); off by default
+PROFILE_ENABLED = bool(os.environ.get('MCRT_PROFILE'))
+
 
 def create_placeholder_image(width=400, height=300, text="Image Not Found", file_id=None):
     """Create a placeholder image when the original file is missing."""
@@ -352,10 +383,11 @@ def view_groups():
     try:
         page = request.args.get('page', 1, type=int)
         status = request.args.get('status', 'undecided')
+        after = request.args.get('after', type=int)
         
         print(f"📁 Groups route called: page={page}, status={status}")
         
-        groups_data = cli.get_groups_data(page=page, per_page=20, status=status)
+        groups_data = cli.get_groups_data(page=page, per_page=20, status=status, cursor=after)
         
         if 'error' in groups_data:
             print(f"❌ Groups error: {groups_data['error']}")
@@ -375,10 +407,11 @@ def view_singles():
     try:
         page = request.args.get('page', 1, type=int)
         status = request.args.get('status', 'undecided')
+        after = request.args.get('after', type=int)
         
         print(f"🖼️ Singles route called: page={page}, status={status}")
         
-        singles_data = cli.get_singles_data(page=page, per_page=50, status=status)
+        singles_data = cli.get_singles_data(page=page, per_page=50, status=status, cursor=after)
         
         if 'error' in singles_data:
             print(f"❌ Singles error: {singles_data['error']}")
@@ -424,25 +457,21 @@ def serve_image(file_id):
             print(f"❌ File {file_id} not found in database")
             return serve_placeholder_image(file_id, "File not in database")
         
-        # Construct full path
-        path_on_drive = file_info['path_on_drive']
-        mount_path = file_info['mount_path']
-        
-        if mount_path and mount_path.strip():
-            full_path = Path(mount_path) / path_on_drive
-        else:
-            full_path = Path(path_on_drive)
+        # Path is pre-joined (and cached) by the CLI interface
+        full_path = file_info['full_path']
+        file_name = os.path.basename(full_path)
         
         print(f"🖼️ Full path: {full_path}")
         
-        file_extension = full_path.suffix.lower()
-        if file_extension in ['.tiff', '.tif']:
+        if full_path.lower().endswith(TIFF_EXTENSIONS):
             print(f"🚫 TIFF file detected, serving placeholder: {full_path}")
-            return serve_placeholder_image(file_id, f"TIFF files not supported in web view: {full_path.name}")
+            return serve_placeholder_image(file_id, f"TIFF files not supported in web view: {file_name}")
 
-        if not full_path.exists():
+        try:
+            os.stat(full_path)
+        except OSError:
             print(f"⚠️ File not found on filesystem: {full_path}")
-            return serve_placeholder_image(file_id, f"File missing: {full_path.name}")
+            return serve_placeholder_image(file_id, f"File missing: {file_name}")
         
         # Check if file is readable
         if not os.access(full_path, os.R_OK):
@@ -452,7 +481,7 @@ def serve_image(file_id):
         # Try to serve the actual file
         try:
             print(f"✅ Serving actual file: {full_path}")
-            return send_file(str(full_path))
+            return send_file(full_path)
         except Exception as e:
             print(f"⚠️ Error sending file {full_path}: {e}")
             return serve_placeholder_image(file_id, f"File error: {str(e)[:50]}")
@@ -472,21 +501,15 @@ def serve_thumbnail(file_id):
             print(f"❌ File {file_id} not found in database")
             return serve_thumbnail_placeholder(file_id, "File not in database")
         
-        # Construct full path
-        path_on_drive = file_info['path_on_drive']
-        mount_path = file_info['mount_path']
-        
-        if mount_path and mount_path.strip():
-            full_path = Path(mount_path) / path_on_drive
-        else:
-            full_path = Path(path_on_drive)
+        full_path = file_info['full_path']
         
-        file_extension = full_path.suffix.lower()
-        if file_extension in ['.tiff', '.tif']:
+        if full_path.lower().endswith(TIFF_EXTENSIONS):
             print(f"🚫 TIFF thumbnail detected, serving placeholder: {full_path}")
-            return serve_thumbnail_placeholder(file_id, f"TIFF files not supported: {full_path.name}")
+            return serve_thumbnail_placeholder(file_id, f"TIFF files not supported: {os.path.basename(full_path)}")
 
-        if not full_path.exists():
+        try:
+            os.stat(full_path)
+        except OSError:
             print(f"⚠️ Thumbnail source not found: {full_path}")
             return serve_thumbnail_placeholder(file_id, "File missing")
         
@@ -494,7 +517,7 @@ def serve_thumbnail(file_id):
         # For now, serve the full image (browser will resize)
         # TODO: Implement actual thumbnail generation
         try:
-            return send_file(str(full_path))
+            return send_file(full_path)
         except Exception as e:
             print(f"⚠️ Error serving thumbnail: {e}")
             return serve_thumbnail_placeholder(file_id, str(e)[:50])
@@ -512,7 +535,7 @@ def api_stats():
         print(f"📊 API stats called: detailed={detailed}")
         
         result = cli.get_stats(detailed=detailed)
-        return jsonify(result)
+        return json_response(result)
         
     except Exception as e:
         print(f"❌ API stats error: {e}")
@@ -521,13 +544,18 @@ def api_stats():
 
 @app.route('/api/review-queue')
 def api_review_queue():
-    """Get review queue via JSON CLI."""
+    """Get review queue via JSON CLI (?stream=1 for one JSON item per line)."""
     try:
         limit = request.args.get('limit', 50, type=int)
         print(f"📋 API review queue called: limit={limit}")
         
+        if request.args.get('stream') == '1':
+            # Items are forwarded as the CLI yields them; the queue is never held whole
+            items = cli.iter_review_queue(limit=limit)
+            return Response(map(ndjson_line, items), mimetype='application/x-ndjson')
+        
         result = cli.get_review_queue(limit=limit)
-        return jsonify(result)
+        return json_response(result)
         
     except Exception as e:
         print(f"❌ API review queue error: {e}")
@@ -809,24 +837,24 @@ def handle_exception(e):
                          details=str(e)), 500
 
 # TEMPLATE FILTERS
+FILESIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
 @app.template_filter('filesize')
 def filesize_filter(bytes_value):
     """Format bytes as human-readable file size."""
     if not bytes_value:
         return "0 B"
     
-    units = ['B', 'KB', 'MB', 'GB', 'TB']
-    unit_index = 0
-    size = float(bytes_value)
-    
-    while size >= 1024 and unit_index < len(units) - 1:
-        size /= 1024
-        unit_index += 1
+    # Each unit is 10 more bits, so the bit length picks it without a loop;
+    # dividing by a power of two gives the same float as repeated /1024
+    n = int(bytes_value)
+    unit_index = min((n.bit_length() - 1) // 10, len(FILESIZE_UNITS) - 1) if n > 0 else 0
+    size = bytes_value / (1 << (10 * unit_index))
     
     if size == int(size):
-        return f"{int(size)} {units[unit_index]}"
+        return f"{int(size)} {FILESIZE_UNITS[unit_index]}"
     else:
-        return f"{size:.1f} {units[unit_index]}"
+        return f"{size:.1f} {FILESIZE_UNITS[unit_index]}"
 
 @app.template_filter('megapixels') 
 def megapixels_filter(width, height):
@@ -893,7 +921,7 @@ def debug_info():
             'db_path': cli.db_path,
             'cli_exists': Path(cli.cli_path).exists(),
             'db_exists': Path(cli.db_path).exists(),
-            'cli_executable': os.access(cli.cli_path, os.X_OK) if Path(cli.cli_path).exists() else False,
+            'cli_executable': os.access(cli.cli_path, os.X_OK),
             'working_directory': os.getcwd(),
             'python_path': os.environ.get('PYTHONPATH'),
             'pil_available': PIL_AVAILABLE,
@@ -921,12 +949,95 @@ def debug_info():
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
 
-def main(db_path=None, host="127.0.0.1", port=5000, debug=False, smoke_test=True):
+# LAZY STARTUP
+_init_lock = threading.Lock()
+_initialized = False
+
+def _lazy_init():
+    """Check template/static directories and self-test the CLI, once."""
+    # One directory listing answers every existence probe below
+    with os.scandir('.') as it:
+        entries = {entry.name: entry for entry in it}
     
-    global cli 
+    # Check template directory
+    if 'templates' not in entries:
+        print("⚠️  Templates directory not found - some pages may not work")
+        print("Copy template files from artifacts to templates/ directory")
+        # Create basic templates directory structure
+        os.makedirs('templates', exist_ok=True)
+    
+    # Check static directory
+    static_entry = entries.get('static')
+    if static_entry is None or not static_entry.is_dir():
+        print("⚠️  Static directory not found - styling may not work")
+        print("Copy CSS and JS files from artifacts to static/ directory")
+        static_children = set()
+    else:
+        with os.scandir('static') as it:
+            static_children = {entry.name for entry in it}
+    
+    # Only touch the filesystem when something is actually missing
+    for subdir in ('css', 'js'):
+        if subdir not in static_children:
+            os.makedirs(os.path.join('static', subdir), exist_ok=True)
+    
+    if app.config.get("SMOKE_TEST"):
+        cli._test_cli_basic()
+
+def _ensure_initialized():
+    """before_request hook running _lazy_init() for the first request only."""
+    global _initialized
+    if _initialized:
+        return
+    with _init_lock:
+        if not _initialized:
+            try:
+                _lazy_init()
+            except Exception as e:
+                # Startup checks are advisory; don't retry them on every request
+                print(f"⚠️  Startup checks failed: {e}")
+                traceback.print_exc()
+            _initialized = True
+
+# Constant parts of the startup banner, joined once at import
+_BANNER_HEAD = "\n".join([
+    "=" * 80,
+    "🚀 Enhanced Media Review Web Interface - JSON-Driven",
+    "=" * 80,
+]) + "\n"
+_BANNER_TAIL = "\n".join([
+    "",
+    "✨ Features:",
+    "  📊 JSON-driven dashboard with real-time stats",
+    "  📁 Group review with image previews and promotion",
+    "  🖼️  Individual image review with keyboard shortcuts",
+    "  ⚡ Enhanced bulk operations with accurate preview",
+    "  🔍 Full-size image viewing with modal dialogs",
+    "  📥 Export functionality with CSV generation",
+    "  📱 Mobile-responsive design",
+    "  🖼️  Smart placeholder images for missing files",
+    "=" * 80,
+]) + "\n"
+
+def create_app(db_path=None, smoke_test=True):
+    """Wire the CLI into the app and return it (also the WSGI-server entry point)."""
+    global cli
     # Delay heavy imports so __main__ can parse args first
     from .cli_interface import MediaToolCLI
 
+    cli = MediaToolCLI(db_path=db_path)
+
+    # however you make `cli` visible to your routes:
+    app.config["CLI"] = cli
+    app.config["SMOKE_TEST"] = smoke_test
+    return app
+
+# Directory checks and the CLI self-test wait for the first request, so
+# only the serving process pays for them (not the reloader's parent).
+app.before_request(_ensure_initialized)
+
+def main(db_path=None, host="127.0.0.1", port=5000, debug=False, smoke_test=True):
+    
     # Check if PIL is available
     if not PIL_AVAILABLE:
         print("⚠️  PIL (Pillow) not available - placeholder images will be text-only")
@@ -935,51 +1046,32 @@ def main(db_path=None, host="127.0.0.1", port=5000, debug=False, smoke_test=True
     # Validate setup before starting
     print("🔍 Validating setup...")
 
-    cli = MediaToolCLI(db_path=db_path)
-
-    # however you make `cli` visible to your routes:
-    app.config["CLI"] = cli
+    create_app(db_path=db_path, smoke_test=smoke_test)
     
-    # Check template directory
-    template_dir = Path('templates')
-    if not template_dir.exists():
-        print("⚠️  Templates directory not found - some pages may not work")
-        print("Copy template files from artifacts to templates/ directory")
-        # Create basic templates directory structure
-        template_dir.mkdir(exist_ok=True)
+    sys.stdout.write(_BANNER_HEAD)
+    sys.stdout.write(
+        f"📂 Database: {cli.db_path}\n"
+        f"⚡ CLI Command: {cli.cli_path}\n"
+        f"🌐 URL: http://localhost:{port}\n"
+        f"🔧 Debug URL: http://localhost:{port}/debug/info\n"
+        f"🏥 Health Check: http://localhost:{port}/health\n"
+    )
+    sys.stdout.write(_BANNER_TAIL)
+    sys.stdout.flush()
     
-    # Check static directory
-    static_dir = Path('static')
-    if not static_dir.exists():
-        print("⚠️  Static directory not found - styling may not work")
-        print("Copy CSS and JS files from artifacts to static/ directory")
-        # Create basic static directory structure
-        static_dir.mkdir(exist_ok=True)
-        (static_dir / 'css').mkdir(exist_ok=True)
-        (static_dir / 'js').mkdir(exist_ok=True)
+    # Debug mode (reloader + interactive debugger) is opt-in
+    debug = debug or os.environ.get('MCRT_DEBUG') == '1'
+    if not debug:
+        print(f"💡 For production use a WSGI server, e.g.: waitress-serve --listen={host}:{port} --call media_ui.app:create_app")
     
-    print("=" * 80)
-    print("🚀 Enhanced Media Review Web Interface - JSON-Driven")
-    print("=" * 80)
-    print(f"📂 Database: {cli.db_path}")
-    print(f"⚡ CLI Command: {cli.cli_path}")
-    print(f"🌐 URL: http://localhost:5000")
-    print(f"🔧 Debug URL: http://localhost:5000/debug/info")
-    print(f"🏥 Health Check: http://localhost:5000/health")
-    print("")
-    print("✨ Features:")
-    print("  📊 JSON-driven dashboard with real-time stats")
-    print("  📁 Group review with image previews and promotion")
-    print("  🖼️  Individual image review with keyboard shortcuts")
-    print("  ⚡ Enhanced bulk operations with accurate preview")
-    print("  🔍 Full-size image viewing with modal dialogs")
-    print("  📥 Export functionality with CSV generation")
-    print("  📱 Mobile-responsive design")
-    print("  🖼️  Smart placeholder images for missing files")
-    print("=" * 80)
+    if PROFILE_ENABLED:
+        from werkzeug.middleware.profiler import ProfilerMiddleware
+        os.makedirs('profiles', exist_ok=True)
+        app.wsgi_app = ProfilerMiddleware(app.wsgi_app, restrictions=[30], profile_dir='./profiles')
+        print("⏱️  Profiling enabled - per-request profiles written to ./profiles")
     
     # Start the server
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    app.run(debug=debug, host=host, port=port, threaded=True, use_reloader=debug)
 
     
 if __name__ == '__main__':
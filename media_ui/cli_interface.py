@@ -1,15 +1,98 @@
 #!/usr/bin/env python3
+from concurrent.futures import Future, ThreadPoolExecutor
 from contextlib import redirect_stderr, redirect_stdout
+from datetime import datetime
+import atexit
+import functools
+import hashlib
+import importlib
+import importlib.util
 import io
+from itertools import groupby
 import json
+import logging
+from operator import itemgetter
 import subprocess
 import os
-from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any
+import tempfile
+from typing import Dict, Iterator, List, Optional, Tuple, Any
 
+import selectors
 import shutil
+import socket
+import sqlite3
 import sys
+import threading
+import time
 
+logger = logging.getLogger(__name__)
+
+# Per-call tracing is off unless MEDIA_CLI_DEBUG=1; logger.debug() is a cheap
+# level check when disabled, unlike print() which always hits stdout.
+if os.environ.get("MEDIA_CLI_DEBUG") == "1":
+    logger.setLevel(logging.DEBUG)
+    if not logger.handlers:
+        logger.addHandler(logging.StreamHandler())
+
+_JSON_DECODER = json.JSONDecoder()
+
+# orjson is optional; when installed it decodes large CLI responses several
+# times faster than the stdlib parser and takes the pipe's bytes as-is
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_fast_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _readline_within(stream, timeout: float) -> Optional[bytes]:
+    """
+    Read one reply line from a child's stdout pipe, waiting on it with a
+    selector rather than a kill timer thread per call. Returns None if the
+    line does not arrive within timeout, b'' if the child closed the pipe.
+    """
+    chunks = []
+    deadline = time.monotonic() + timeout
+    with selectors.DefaultSelector() as sel:
+        sel.register(stream, selectors.EVENT_READ)
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not sel.select(remaining):
+                return None
+            # read1 never blocks once the pipe is readable
+            chunk = stream.read1(STREAM_BUFSIZE)
+            if not chunk:
+                return b''
+            chunks.append(chunk)
+            if b'\n' in chunk:
+                return b''.join(chunks)
+
+
+def _parse_tolerant_json(text: str) -> Any:
+    """
+    Parse CLI output that should be one JSON document but may carry stray
+    lines around it: try the whole text, then scan forward for the first
+    '{' that starts a complete object.
+    """
+    try:
+        return _fast_loads(text)
+    except json.JSONDecodeError as e:  # orjson's error subclasses this too
+        first_error = e
+
+    # An object can only end at a '}', so truncated output (none left after
+    # a '{') fails here instead of re-decoding to the end from every '{'
+    end = text.rfind('}')
+    i = text.find('{', 0, end) if end != -1 else -1
+    while i != -1:
+        try:
+            return _JSON_DECODER.raw_decode(text, i)[0]
+        except json.JSONDecodeError:
+            i = text.find('{', i + 1, end)
+    raise first_error
+
+
+@functools.lru_cache(maxsize=1)
 def _detect_backend():
     """
     Returns ("import", callable) or ("exec", path) or ("module", "media_tool").
@@ -26,19 +109,137 @@ def _detect_backend():
 
     return ("module", "media_tool")
 
+
+# Read buffer for the streamed stdout pipe; large exports arrive in far
+# fewer read() calls than with the 8 KiB default
+STREAM_BUFSIZE = 1 << 20
+
+# files columns get_file_info reports as '' when NULL
+# (note: it's 'phash', not 'hash_phash')
+FILE_INFO_OPTIONAL_COLUMNS = ('review_note', 'hash_sha256', 'phash', 'reviewed_at')
+
+# get_file_info's query; constant text, so it stays in the statement cache
+FILE_INFO_SQL = f"""
+    SELECT 
+        f.file_id, f.path_on_drive, f.size_bytes, f.width, f.height,
+        f.review_status, f.type, f.group_id, f.duplicate_of, 
+        f.created_at, f.is_large,
+        {', '.join('f.' + c for c in FILE_INFO_OPTIONAL_COLUMNS)},
+        d.label as drive_label, 
+        d.mount_path,
+        -- mount + '/' + path, joined here rather than in Python
+        CASE WHEN TRIM(COALESCE(d.mount_path, '')) != ''
+             THEN RTRIM(d.mount_path, '/') || '/' || LTRIM(COALESCE(f.path_on_drive, ''), '/')
+             ELSE COALESCE(f.path_on_drive, '')
+        END as complete_path,
+        CASE WHEN f.file_id = g.original_file_id THEN 1 ELSE 0 END as is_original
+    FROM files f
+    LEFT JOIN drives d ON d.drive_id = f.drive_id
+    LEFT JOIN groups g ON g.group_id = f.group_id
+    WHERE f.file_id = ?
+"""
+
+# Seconds to wait for a freshly started `serve --socket` daemon to listen
+DAEMON_START_TIMEOUT = 5.0
+
+# Prefetched pages kept waiting for their Next click
+PREFETCH_MAX_PAGES = 8
+
+# media_tool.config's default, for when media_tool itself can't be imported
+DEFAULT_DB_MMAP_BYTES = 256 * 1024 * 1024
+
+# Relative locations probed when no database path is given: same, parent
+# and grandparent directory
+DB_PATH_CANDIDATES = ('./media_index.db', '../media_index.db', '../../media_index.db')
+
+# (db_path argument, MEDIA_DB_PATH, cwd) -> path found by _find_db_path
+_DB_PATH_CACHE: Dict[Tuple[Optional[str], Optional[str], str], str] = {}
+
+
 class MediaToolCLI:
     """CLI interface with automatic path detection and enhanced debugging."""
     
     def __init__(self, cli_path: str = None, db_path: str = None, do_smoke_test: bool = False):
         self.mode, self.cli_target = _detect_backend()
+        if self.mode == "exec":
+            self.cli_target = os.path.abspath(self.cli_target)
         self.cli_path = (
             "import:media_tool.main.main" if self.mode == "import"
             else self.cli_target if self.mode == "exec"
             else "module:media_tool"
         )
 
-        
-        self.db_path = self._find_db_path(db_path)
+        # Resolved once to a plain absolute str; later code does no re-resolution
+        self.db_path = os.path.abspath(self._find_db_path(db_path))
+
+        # Fixed leading argv: the interpreter/script for subprocesses, and the
+        # --db option every command starts with
+        self._cmd_prefix = (
+            [self.cli_target] if self.mode == "exec"
+            else [sys.executable, "-m", "media_tool"]
+        )
+        self._db_argv = ['--db', self.db_path]
+
+        # file_id -> path info for image serving; emptied when a data_version
+        # check sees another commit (e.g. a rescan moved files), and on close()
+        self._file_path_cache = functools.lru_cache(maxsize=4096)(self._lookup_file_path)
+        self._file_path_cache_version: Optional[int] = None
+
+        # One shared read-only connection for all direct queries, opened on
+        # first use so a missing DB is not created here; the lock serializes
+        # Flask's request threads on it.
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_lock = threading.Lock()
+
+        # ('groups' | 'singles', status) -> (total, PRAGMA data_version counted at);
+        # dropped whenever this client writes, and stale once anyone else commits
+        self._count_cache: Dict[Tuple[str, str], Tuple[int, int]] = {}
+
+        # detailed flag -> (stats payload, PRAGMA data_version it was computed at)
+        self._stats_cache: Dict[bool, Tuple[Dict[str, Any], int]] = {}
+
+        # drive_id -> label for list pages, and the data_version it was read at
+        self._drive_labels: Dict[int, Optional[str]] = {}
+        self._drive_labels_version: Optional[int] = None
+
+        # The next groups/singles page is loaded in the background while the
+        # user looks at the current one; keyed like the Next link's request,
+        # with the data_version it was scheduled at. The pool starts on first use.
+        self._prefetch_pool: Optional[ThreadPoolExecutor] = None
+        self._prefetch_cache: Dict[tuple, Tuple[Future, Optional[int]]] = {}
+        self._prefetch_lock = threading.Lock()
+
+        # Run media_tool in-process whenever it can be imported, even if the
+        # backend was detected as exec/module; subprocess is the last resort.
+        self._main = self._load_main()
+        self._mmap_bytes = self._db_mmap_bytes()
+
+        # In-process runs swap process-wide sys.argv/stdout; serialize them
+        # across the threaded Flask server's request threads.
+        self._run_lock = threading.Lock()
+
+        # `media-tool serve` co-process answering JSON commands line by line;
+        # started on first use when media_tool can't run in-process
+        self._server: Optional[subprocess.Popen] = None
+        self._server_lock = threading.Lock()
+        # Replies are read by selecting on the pipe, which Windows only allows on sockets
+        self._use_server = os.name != 'nt'
+
+        # With MEDIA_CLI_SOCKET set, talk to a shared `serve --socket` daemon
+        # there instead, so UI workers and restarts all reuse one warm process.
+        # A daemon answers from the database it was started with, so each
+        # database gets its own socket, named by a hash of its resolved path.
+        socket_base = os.environ.get('MEDIA_CLI_SOCKET') if hasattr(socket, 'AF_UNIX') else None
+        self._socket_path = (
+            f"{socket_base}.{hashlib.sha1(os.path.realpath(self.db_path).encode('utf-8')).hexdigest()[:12]}"
+            if socket_base else None
+        )
+        self._sock: Optional[socket.socket] = None
+        self._sock_file = None
+        self._daemon: Optional[subprocess.Popen] = None
+        # Reap the serve child on interpreter exit rather than leaving it
+        # to notice the closed pipe on its own
+        atexit.register(self.close)
 
         print("🔧 CLI Interface initialized:")
         print(f"   CLI: {self.cli_path}")
@@ -47,63 +248,95 @@ class MediaToolCLI:
         if do_smoke_test:
             self._test_cli_basic()
     
-    def _find_cli_path(self, cli_path):
-        """Find CLI script automatically."""
-        if cli_path and Path(cli_path).exists():
-            return cli_path
-        
-        # Check environment variable
-        env_path = os.environ.get('MEDIA_CLI')
-        if env_path and Path(env_path).exists():
-            return env_path
-        
-        # Check common locations
-        possible_paths = [
-            './media_tool_cli.py',      # Same directory
-            '../media_tool_cli.py',     # Parent directory
-            '../../media_tool_cli.py'   # Grandparent directory
-        ]
-        
-        for path in possible_paths:
-            abs_path = Path(path).resolve()
-            print(f"🔍 Checking CLI path: {abs_path} - {'EXISTS' if abs_path.exists() else 'NOT FOUND'}")
-            if abs_path.exists():
-                return str(abs_path)
-        
-        raise FileNotFoundError("media_tool_cli.py not found in any expected location")
+    def _load_main(self):
+        """Return media_tool's main() for in-process calls, or None."""
+        if self.mode == "import":
+            self._capture = importlib.import_module("media_tool.jsonio").capture
+            return self.cli_target
+
+        search_dir = self._search_dirs()[0]
+        added = search_dir not in sys.path
+        if added:
+            sys.path.append(search_dir)
+        try:
+            main = importlib.import_module("media_tool.main").main
+            self._capture = importlib.import_module("media_tool.jsonio").capture
+            return main
+        except Exception:
+            if added:
+                sys.path.remove(search_dir)
+            return None
+    
+    def _db_mmap_bytes(self) -> int:
+        """mmap_size for the read connection: media_tool's DB_MMAP_BYTES setting."""
+        try:
+            return int(importlib.import_module("media_tool.config").DB_MMAP_BYTES)
+        except Exception:
+            pass
+        # media_tool is not importable here; honour its env override directly
+        try:
+            return max(0, int(os.environ.get("MEDIA_TOOL_MMAP_BYTES", DEFAULT_DB_MMAP_BYTES)))
+        except ValueError:
+            return DEFAULT_DB_MMAP_BYTES
+    
+    def _search_dirs(self):
+        """Directories where media_tool may live outside the default sys.path."""
+        # exec: look next to the executable; module: where `python -m` would
+        if self.mode == "exec":
+            return [os.path.dirname(self.cli_target)]
+        return [os.getcwd()]
     
     def _find_db_path(self, db_path):
-        """Find database automatically."""
-        if db_path and Path(db_path).exists():
+        """Find database automatically (cached per argument, env and cwd)."""
+        key = (db_path, os.environ.get('MEDIA_DB_PATH'), os.getcwd())
+        cached = _DB_PATH_CACHE.get(key)
+        if cached is not None:
+            # One stat to confirm it is still there instead of a new search
+            try:
+                os.stat(cached)
+                return cached
+            except OSError:
+                del _DB_PATH_CACHE[key]
+        
+        found = self._search_db_path(db_path)
+        _DB_PATH_CACHE[key] = found
+        return found
+    
+    def _search_db_path(self, db_path):
+        if db_path and os.path.exists(db_path):
             return db_path
         
         # Check environment variable
         env_path = os.environ.get('MEDIA_DB_PATH')
-        if env_path and Path(env_path).exists():
+        if env_path and os.path.exists(env_path):
             return env_path
         
-        # Check common locations
-        possible_paths = [
-            './media_index.db',      # Same directory
-            '../media_index.db',     # Parent directory  
-            '../../media_index.db'   # Grandparent directory
-        ]
-        
-        for path in possible_paths:
-            abs_path = Path(path).resolve()
-            print(f"🔍 Checking DB path: {abs_path} - {'EXISTS' if abs_path.exists() else 'NOT FOUND'}")
-            if abs_path.exists():
-                return str(abs_path)
+        # Check common locations, stopping at the first that exists
+        found = next((p for p in map(os.path.abspath, DB_PATH_CANDIDATES) if os.path.exists(p)), None)
+        if found:
+            logger.debug("🔍 Found DB at %s", found)
+            return found
         
         raise FileNotFoundError("media_index.db not found in any expected location")
     
     def _test_cli_basic(self):
+        # Spawning --help is only worth it when explicitly requested (e.g. CI)
+        if os.environ.get('MCRT_STRICT_CLI') != '1':
+            if self.mode == "import":
+                ok = True  # the entry point was imported already
+            elif self.mode == "exec":
+                ok = os.access(self.cli_target, os.X_OK)
+            else:
+                ok = importlib.util.find_spec(self.cli_target) is not None
+            print("✅ CLI available" if ok else f"❌ CLI not available: {self.cli_path}")
+            return
+
         try:
             print("🧪 Testing CLI with basic command...")
             buf_out, buf_err = io.StringIO(), io.StringIO()
             # capture noisy --help output even in import mode
             with redirect_stdout(buf_out), redirect_stderr(buf_err):
-                success, stdout, stderr = self.run_command("--help", timeout=10)
+                success, stdout, stderr = self.run_command("--help", timeout=5)
             if success:
                 print("✅ CLI help command successful")
             else:
@@ -114,69 +347,100 @@ class MediaToolCLI:
         except Exception as e:
             print(f"❌ CLI test error: {e}")
     
+    def _subprocess_cmd(self, argv: List[str]) -> List[str]:
+        return self._cmd_prefix + argv  # e.g., /home/.../.venv/bin/media-tool --db ...
+    
     def run_command(self, *args, timeout: int = 60) -> Tuple[bool, str, str]:
-        argv = ['--db', self.db_path, *[str(a) for a in args]]
+        argv = self._db_argv.copy()
+        argv += map(str, args)
 
         
-        print(f"🔧 Mode: {self.mode}")
-        print(f"🔧 Working directory: {os.getcwd()}")
-        print(f"🔧 Python path: {os.environ.get('PYTHONPATH', 'Not set')}")
-
-        print(f"🔧 argv -> {argv!r}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("🔧 Mode: %s", self.mode)
+            logger.debug("🔧 Working directory: %s", os.getcwd())
+            logger.debug("🔧 Python path: %s", os.environ.get('PYTHONPATH', 'Not set'))
+            logger.debug("🔧 argv -> %r", argv)
 
         try:
-            if self.mode == "import":
-                from media_tool.main import main as media_tool_main  # re-import for clarity
+            if self._main is not None:
+                # Fresh buffers per call: a handler left pointing at one can
+                # only ever collect that call's output
                 buf_out, buf_err = io.StringIO(), io.StringIO()
-                old_argv = sys.argv
-                try:
-                    sys.argv = ["media-tool", *argv]
-                    with redirect_stdout(buf_out), redirect_stderr(buf_err):
-                        rc = media_tool_main()
-                    rc = 0 if rc is None else int(rc)
-                    return rc == 0, buf_out.getvalue(), buf_err.getvalue()
-                finally:
-                    sys.argv = old_argv
+                root = logging.getLogger()
+                with self._run_lock:
+                    old_argv = sys.argv
+                    old_out, old_err = sys.stdout, sys.stderr
+                    old_handlers, old_level = root.handlers[:], root.level
+                    try:
+                        sys.argv = ["media-tool", *argv]
+                        sys.stdout, sys.stderr = buf_out, buf_err
+                        try:
+                            rc = self._main()
+                        except SystemExit as exit_:
+                            # argparse exits for --help and usage errors
+                            rc = exit_.code if exit_.code is None or isinstance(exit_.code, int) else 1
+                    finally:
+                        sys.stdout, sys.stderr = old_out, old_err
+                        sys.argv = old_argv
+                        # Drop the handler media_tool's basicConfig bound to
+                        # buf_err so other threads' logging can't land in it
+                        root.handlers[:] = old_handlers
+                        root.setLevel(old_level)
+                        out, err = buf_out.getvalue(), buf_err.getvalue()
+                rc = 0 if rc is None else int(rc)
+                return rc == 0, out, err
 
-            elif self.mode == "exec":
-                cmd = [self.cli_target, *argv]  # e.g., /home/.../.venv/bin/media-tool
-                print(f"🔧 Running command: {' '.join(cmd)}")
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
-                if result.stdout:
-                    print(f"🔧 STDOUT (first 500 chars): {result.stdout[:500]}")
-                if result.stderr:
-                    print(f"🔧 STDERR: {result.stderr}")
-                return result.returncode == 0, result.stdout, result.stderr
-
-            else:  # "module"
-                cmd = [sys.executable, "-m", "media_tool", *argv]
-                print(f"🔧 Running command: {' '.join(cmd)}")
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
-                if result.stdout:
-                    print(f"🔧 STDOUT (first 500 chars): {result.stdout[:500]}")
-                if result.stderr:
-                    print(f"🔧 STDERR: {result.stderr}")
-                return result.returncode == 0, result.stdout, result.stderr
+            # Last resort: a fresh process per command
+            cmd = self._subprocess_cmd(argv)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("🔧 Running command: %s", ' '.join(cmd))
+            # Bytes pipes: one UTF-8 decode below, no universal-newline pass
+            result = subprocess.run(cmd, capture_output=True, timeout=timeout)
+            out = result.stdout.decode('utf-8')
+            err = result.stderr.decode('utf-8', errors='replace')
+            if out:
+                logger.debug("🔧 STDOUT (first 500 chars): %s", out[:500])
+            if err:
+                logger.debug("🔧 STDERR: %s", err)
+            return result.returncode == 0, out, err
 
         except subprocess.TimeoutExpired:
             error_msg = f"Command timed out after {timeout}s"
-            print(f"❌ {error_msg}")
+            logger.error(f"❌ {error_msg}")
             return False, "", error_msg
         except Exception as e:
             error_msg = str(e)
-            print(f"❌ Command execution error: {error_msg}")
+            logger.error(f"❌ Command execution error: {error_msg}")
             return False, "", error_msg
     
     def run_json_command(self, *args, timeout: int = 60) -> Dict[str, Any]:
         """Run CLI command with --json flag and parse result."""
-        success, stdout, stderr = self.run_command(*args, '--json', timeout=timeout)
+        if self._main is None:
+            request = self._server_transport()
+            if request is not None:
+                result = request(list(map(str, args)), timeout)
+                if result is not None:
+                    return result
+            return self.run_json_command_streaming(*args, timeout=timeout)
+
+        if self._main is not None:
+            # In-process: take media_tool's payload dict as-is, no JSON round trip
+            with self._capture() as payloads:
+                success, stdout, stderr = self.run_command(*args, '--json', timeout=timeout)
+            if payloads:
+                if success:
+                    logger.debug("✅ JSON payload captured in-process")
+                    return payloads[-1]
+                stdout = json.dumps(payloads[-1])
+        else:
+            success, stdout, stderr = self.run_command(*args, '--json', timeout=timeout)
         
         if not success:
             error_msg = stderr or 'Command failed'
-            print(f"❌ JSON command failed: {error_msg}")
+            logger.error(f"❌ JSON command failed: {error_msg}")
             return {
                 'error': error_msg,
-                'command': ' '.join(str(arg) for arg in args),
+                'command': ' '.join(map(str, args)),
                 'debug_info': {
                     'success': success,
                     'stdout': stdout[:500] if stdout else None,
@@ -185,38 +449,321 @@ class MediaToolCLI:
             }
         
         if not stdout.strip():
-            print(f"❌ Empty stdout from command")
+            logger.error(f"❌ Empty stdout from command")
             return {
                 'error': 'Empty response from CLI',
-                'command': ' '.join(str(arg) for arg in args)
+                'command': ' '.join(map(str, args))
             }
         
         try:
-            # tolerant JSON parse
-            try:
-                parsed = json.loads(stdout.strip())
-            except json.JSONDecodeError:
-                s = stdout
-                start = s.rfind('{')
-                end = s.rfind('}')
-                if start != -1 and end != -1 and end > start:
-                    parsed = json.loads(s[start:end+1])
-                else:
-                    raise
-            print(f"✅ JSON parsed successfully")
+            parsed = _parse_tolerant_json(stdout)
+            logger.debug("✅ JSON parsed successfully")
             return parsed
         except json.JSONDecodeError as e:
-            print(f"❌ JSON decode error: {e}")
-            print(f"❌ Raw output: {stdout[:500]}")
+            logger.error(f"❌ JSON decode error: {e}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("❌ Raw output: %s", stdout[:500])
             return {
                 'error': f'Invalid JSON response: {e}',
                 'raw_output': stdout[:1000],
-                'command': ' '.join(str(arg) for arg in args)
+                'command': ' '.join(map(str, args))
+            }
+    
+    def _server_request(self, argv: List[str], timeout: int) -> Optional[Dict[str, Any]]:
+        """
+        Send one command to the `serve` co-process and read its one-line reply.
+        Returns None when the co-process cannot serve it (failed to start,
+        crashed, or a media-tool without `serve`) so the caller falls back.
+        """
+        with self._server_lock:
+            proc = self._server
+            if proc is None or proc.poll() is not None:
+                try:
+                    proc = self._server = subprocess.Popen(
+                        self._subprocess_cmd(self._db_argv + ['serve']),
+                        stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                        stderr=subprocess.DEVNULL, bufsize=STREAM_BUFSIZE)
+                except OSError as e:
+                    logger.warning(f"⚠️ CLI server unavailable, using a process per command: {e}")
+                    self._use_server = False
+                    return None
+            
+            try:
+                proc.stdin.write(json.dumps(argv).encode('utf-8') + b'\n')
+                proc.stdin.flush()
+                line = _readline_within(proc.stdout, timeout)
+            except OSError:
+                line = b''
+            
+            if line:
+                return self._decode_reply(line, argv)
+            
+            if line is None:
+                proc.kill()  # still busy with the command that timed out
+            self._stop_server()
+            if line is None:
+                error_msg = f"Command timed out after {timeout}s"
+                logger.error(f"❌ {error_msg}")
+                return {'error': error_msg, 'command': ' '.join(argv)}
+            logger.warning("⚠️ CLI server exited, using a process per command")
+            self._use_server = False
+            return None
+    
+    def _server_transport(self):
+        """The request function for the serve co-process or daemon, if one is in use."""
+        if self._main is not None or not self._use_server:
+            return None
+        return self._socket_request if self._socket_path else self._server_request
+    
+    def _decode_reply(self, line: bytes, argv: List[str]) -> Dict[str, Any]:
+        try:
+            return _fast_loads(line)
+        except json.JSONDecodeError as e:
+            logger.error(f"❌ JSON decode error: {e}")
+            return {'error': f'Invalid JSON response: {e}', 'command': ' '.join(argv)}
+    
+    def _socket_request(self, argv: List[str], timeout: int) -> Optional[Dict[str, Any]]:
+        """
+        _server_request over this database's MEDIA_CLI_SOCKET daemon, started
+        here if nobody is listening yet. Returns None when it cannot be used.
+        """
+        request = json.dumps(argv).encode('utf-8') + b'\n'
+        with self._server_lock:
+            for _ in range(2):
+                if self._sock is None and not self._connect_daemon():
+                    break
+                try:
+                    self._sock.settimeout(timeout)
+                    self._sock_file.write(request)
+                    self._sock_file.flush()
+                except OSError:
+                    # The daemon exited while we were idle; nothing was sent,
+                    # so reconnect (restarting it) and send once more
+                    self._close_daemon_socket()
+                    continue
+                try:
+                    line = self._sock_file.readline()
+                except socket.timeout:
+                    self._close_daemon_socket()
+                    error_msg = f"Command timed out after {timeout}s"
+                    logger.error(f"❌ {error_msg}")
+                    return {'error': error_msg, 'command': ' '.join(argv)}
+                except OSError:
+                    line = b''
+                if line:
+                    return self._decode_reply(line, argv)
+                break
+            
+            self._close_daemon_socket()
+            logger.warning(f"⚠️ CLI daemon at {self._socket_path} unavailable, using a process per command")
+            self._use_server = False
+            return None
+    
+    def _connect_daemon(self) -> bool:
+        """Connect to the daemon socket, starting the daemon if nobody listens."""
+        delay = 0.01
+        deadline = time.monotonic() + DAEMON_START_TIMEOUT
+        while True:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                sock.connect(self._socket_path)
+            except (FileNotFoundError, ConnectionRefusedError):
+                sock.close()
+                if self._daemon is None or self._daemon.poll() is not None:
+                    try:
+                        # Own session, so it outlives this process as intended
+                        self._daemon = subprocess.Popen(
+                            self._subprocess_cmd(self._db_argv + ['serve', '--socket', self._socket_path]),
+                            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                            stderr=subprocess.DEVNULL, start_new_session=True)
+                    except OSError as e:
+                        logger.warning(f"⚠️ Could not start CLI daemon: {e}")
+                        return False
+                if time.monotonic() >= deadline:
+                    return False
+                time.sleep(delay)
+                delay = min(delay * 2, 0.5)
+                continue
+            except OSError:
+                sock.close()
+                return False
+            self._sock, self._sock_file = sock, sock.makefile('rwb')
+            return True
+    
+    def _close_daemon_socket(self):
+        """Drop this client's daemon connection; the daemon keeps running."""
+        if self._sock is not None:
+            for f in (self._sock_file, self._sock):
+                try:
+                    f.close()
+                except OSError:
+                    pass
+            self._sock = self._sock_file = None
+    
+    def _stop_server(self):
+        """End the `serve` co-process; call with self._server_lock held."""
+        proc, self._server = self._server, None
+        if proc is None:
+            return
+        try:
+            proc.stdin.close()  # EOF ends its read loop
+            proc.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            proc.kill()
+            proc.wait()
+        proc.stdout.close()
+    
+    def run_json_command_streaming(self, *args, timeout: int = 60) -> Dict[str, Any]:
+        """
+        Run a CLI command in a subprocess and decode its JSON output.
+
+        stdout is read whole as bytes and handed to the decoder without a text
+        decode first; output with stray lines around the JSON falls back to
+        the tolerant parser. stderr goes to a temp file meanwhile.
+        """
+        cmd = self._subprocess_cmd(self._db_argv)
+        cmd += map(str, args)
+        cmd.append('--json')
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("🔧 Streaming command: %s", ' '.join(cmd))
+        
+        # stderr goes to a temp file so a chatty child cannot fill the pipe
+        # and block while we are still reading stdout
+        with tempfile.TemporaryFile(mode='w+') as err_file:
+            try:
+                # bytes mode: the decoder takes UTF-8 directly, no str copy first
+                proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=err_file,
+                                        bufsize=STREAM_BUFSIZE)
+            except OSError as e:
+                logger.error(f"❌ Command execution error: {e}")
+                return {'error': str(e), 'command': ' '.join(map(str, args))}
+            
+            timed_out = threading.Event()
+            def _kill():
+                timed_out.set()
+                proc.kill()
+            timer = threading.Timer(timeout, _kill)
+            timer.start()
+            try:
+                with proc.stdout:
+                    data = proc.stdout.read()
+                parsed = decode_error = None
+                # Empty output (usually a failed command) never reaches the decoder
+                empty = not data.strip()
+                if not empty:
+                    try:
+                        parsed = _fast_loads(data)
+                    except json.JSONDecodeError:
+                        # e.g. a log line on stdout; find the object around it
+                        try:
+                            parsed = _parse_tolerant_json(data.decode('utf-8', errors='replace'))
+                        except json.JSONDecodeError as e:
+                            decode_error = e
+                returncode = proc.wait()
+            finally:
+                timer.cancel()
+            
+            err_file.seek(0)
+            stderr = err_file.read()
+        
+        if not (timed_out.is_set() or returncode or empty or decode_error is not None):
+            logger.debug("✅ JSON parsed successfully")
+            return parsed
+        
+        command = ' '.join(map(str, args))
+        if timed_out.is_set():
+            error_msg = f"Command timed out after {timeout}s"
+            logger.error(f"❌ {error_msg}")
+            return {'error': error_msg, 'command': command}
+        
+        if returncode != 0:
+            error_msg = stderr or 'Command failed'
+            logger.error(f"❌ JSON command failed: {error_msg}")
+            return {
+                'error': error_msg,
+                'command': command,
+                'debug_info': {
+                    'success': False,
+                    'stdout': json.dumps(parsed)[:500] if parsed is not None else None,
+                    'stderr': stderr[:500] if stderr else None
+                }
             }
+        
+        if empty:
+            logger.error(f"❌ Empty stdout from command")
+            return {'error': 'Empty response from CLI', 'command': command}
+        
+        logger.error(f"❌ JSON decode error: {decode_error}")
+        return {'error': f'Invalid JSON response: {decode_error}', 'command': command}
+    
+    def run_json_stream(self, *args, timeout: int = 60) -> Iterator[Dict[str, Any]]:
+        """
+        Yield the items of a CLI command run with --json --stream one at a time.
+
+        In a subprocess the CLI writes one JSON object per line, so the first
+        item is decoded while the rest are still being read. In-process and
+        over serve the items come back as one captured payload instead.
+        Errors are logged and end the iteration early.
+        """
+        if self._main is not None or self._server_transport() is not None:
+            payload = self.run_json_command(*args, '--stream', timeout=timeout)
+            if 'error' in payload or payload.get('result') == 'error':
+                logger.error(f"❌ Stream command failed: {payload.get('error')}")
+                return
+            yield from (payload.get('data') or {}).get('items', [])
+            return
+        
+        cmd = self._subprocess_cmd(self._db_argv)
+        cmd += map(str, args)
+        cmd += ('--json', '--stream')
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("🔧 Streaming command: %s", ' '.join(cmd))
+        try:
+            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                    bufsize=STREAM_BUFSIZE)
+        except OSError as e:
+            logger.error(f"❌ Command execution error: {e}")
+            return
+        
+        timed_out = threading.Event()
+        def _kill():
+            timed_out.set()
+            proc.kill()
+        timer = threading.Timer(timeout, _kill)
+        timer.start()
+        try:
+            for line in proc.stdout:
+                if line.strip():
+                    yield _fast_loads(line)
+        except json.JSONDecodeError as e:
+            logger.error(f"❌ JSON decode error in stream from {' '.join(map(str, args))}: {e}")
+        finally:
+            timer.cancel()
+            proc.stdout.close()
+            # The consumer may stop early; don't leave the child writing to a closed pipe
+            stopped_early = proc.poll() is None
+            if stopped_early:
+                proc.kill()
+            returncode = proc.wait()
+            if timed_out.is_set():
+                logger.error(f"❌ Command timed out after {timeout}s")
+            elif returncode != 0 and not stopped_early:
+                logger.error(f"❌ Stream command failed: {' '.join(map(str, args))}")
+    
+    def _submit(self, args: List[Any]) -> Dict[str, Any]:
+        """Run a write command, dropping read caches it would make stale."""
+        self._invalidate_read_caches()
+        return self.run_json_command(*args)
     
     def get_stats(self, detailed: bool = False) -> Dict[str, Any]:
         """Get database statistics with enhanced error handling."""
-        print(f"📊 Getting stats (detailed={detailed})...")
+        logger.debug("📊 Getting stats (detailed=%s)...", detailed)
+        # The dashboard asks on every load; reuse the last answer until the DB changes
+        version = self._data_version()
+        hit = self._stats_cache.get(detailed)
+        if hit is not None and version is not None and hit[1] == version:
+            return hit[0]
+        
         args = ['stats']
         if detailed:
             args.append('--detailed')
@@ -225,44 +772,39 @@ class MediaToolCLI:
         
         # If CLI returns error, try to get basic info another way
         if 'error' in result:
-            print(f"📊 CLI stats failed, trying direct database access...")
+            logger.debug("📊 CLI stats failed, trying direct database access...")
             return self._get_stats_fallback()
         
+        if version is not None:
+            self._stats_cache[detailed] = (result, version)
         return result
     
     def _get_stats_fallback(self) -> Dict[str, Any]:
         """Fallback stats method using direct database access."""
         try:
-            import sqlite3
-            from datetime import datetime
             
-            print(f"📊 Attempting direct database connection to: {self.db_path}")
+            logger.debug("📊 Attempting direct database connection to: %s", self.db_path)
             
-            with sqlite3.connect(self.db_path) as conn:
-                # Basic counts
-                file_count = conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
-                group_count = conn.execute("SELECT COUNT(*) FROM groups").fetchone()[0]
-                
-                # Status breakdown
-                status_rows = conn.execute("""
-                    SELECT review_status, COUNT(*) 
-                    FROM files 
-                    GROUP BY review_status
-                """).fetchall()
-                
-                status_counts = dict(status_rows)
-                
-                # Basic size info
-                size_info = conn.execute("""
+            with self._conn_lock:
+                conn = self._connection()
+                # All counts in one pass over files
+                (file_count, group_count, drive_count, total_bytes, large_count,
+                 image_count, video_count,
+                 undecided_count, keep_count, not_needed_count) = conn.execute("""
                     SELECT 
-                        COUNT(*) as total_files,
-                        COALESCE(SUM(size_bytes), 0) as total_bytes,
-                        COUNT(CASE WHEN type='image' THEN 1 END) as image_count,
-                        COUNT(CASE WHEN type='video' THEN 1 END) as video_count
+                        COUNT(*),
+                        (SELECT COUNT(*) FROM groups),
+                        (SELECT COUNT(*) FROM drives),
+                        COALESCE(SUM(size_bytes), 0),
+                        SUM(is_large = 1),
+                        SUM(type = 'image'),
+                        SUM(type = 'video'),
+                        SUM(review_status = 'undecided'),
+                        SUM(review_status = 'keep'),
+                        SUM(review_status = 'not_needed')
                     FROM files
                 """).fetchone()
                 
-                total_bytes = size_info[1] or 0
                 
                 return {
                     "command": "stats",
@@ -270,9 +812,9 @@ class MediaToolCLI:
                     "data": {
                         "files": {
                             "total": file_count,
-                            "images": size_info[2] or 0,
-                            "videos": size_info[3] or 0,
-                            "large_files": 0
+                            "images": image_count or 0,
+                            "videos": video_count or 0,
+                            "large_files": large_count or 0
                         },
                         "groups": {
                             "total": group_count,
@@ -282,22 +824,22 @@ class MediaToolCLI:
                             "average_size": 0
                         },
                         "review_status": {
-                            "undecided": status_counts.get('undecided', 0),
-                            "keep": status_counts.get('keep', 0),
-                            "not_needed": status_counts.get('not_needed', 0)
+                            "undecided": undecided_count or 0,
+                            "keep": keep_count or 0,
+                            "not_needed": not_needed_count or 0
                         },
                         "storage": {
                             "total_bytes": total_bytes,
                             "total_gb": round(total_bytes / (1024**3), 2),
                             "average_mb": round((total_bytes / file_count / (1024**2)) if file_count > 0 else 0, 1)
                         },
-                        "drives": 0
+                        "drives": drive_count
                     },
                     "fallback": True
                 }
                 
         except Exception as e:
-            print(f"❌ Fallback stats failed: {e}")
+            logger.error(f"❌ Fallback stats failed: {e}")
             return {
                 'error': f'Both CLI and direct database access failed: {e}',
                 'cli_path': self.cli_path,
@@ -309,54 +851,101 @@ class MediaToolCLI:
         """Get review queue via JSON CLI."""
         return self.run_json_command('review-queue', '--limit', limit)
     
-    def get_file_info(self, file_id: int) -> Dict[str, Any]:
-        """Get file information."""
-        # This would need to be implemented in your CLI
-        # For now, return a basic structure
-        return {
-            "file_id": file_id,
-            "path_on_drive": "Unknown",
-            "width": None,
-            "height": None,
-            "size_bytes": None,
-            "review_status": "undecided",
-            "is_original": False,
-            "drive_label": None
-        }
+    def iter_review_queue(self, limit: int = 50) -> Iterator[Dict[str, Any]]:
+        """Yield review queue items as the CLI produces them."""
+        return self.run_json_stream('review-queue', '--limit', limit)
     
     def get_file_path_info(self, file_id: int) -> Optional[Dict[str, Any]]:
-        """Get file path information for serving."""
+        """Get file path information for serving (cached per file_id)."""
         try:
-            import sqlite3
-            with sqlite3.connect(self.db_path) as conn:
-                row = conn.execute("""
-                    SELECT f.path_on_drive, d.mount_path
-                    FROM files f
-                    LEFT JOIN drives d ON d.drive_id = f.drive_id
-                    WHERE f.file_id = ?
-                """, (file_id,)).fetchone()
-                
-                if row:
-                    return {
-                        'path_on_drive': row[0],
-                        'mount_path': row[1] or ''
-                    }
-                return None
+            # One PRAGMA read; a commit since the last check empties the cache
+            self._data_version()
+            return self._file_path_cache(file_id)
         except Exception as e:
-            print(f"❌ Error getting file path info: {e}")
+            logger.error(f"❌ Error getting file path info: {e}")
             return None
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return the shared connection; call with self._conn_lock held."""
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False,
+                                   cached_statements=256, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            # 64 MiB page cache; it survives across requests on this connection
+            conn.execute("PRAGMA cache_size=-65536")
+            conn.execute(f"PRAGMA mmap_size={self._mmap_bytes}")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            # Reads only from here on; every write goes through media_tool
+            conn.execute("PRAGMA query_only=ON")
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        """Close the shared read connection, the CLI server and the prefetch pool; all restart on next use."""
+        with self._conn_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+        with self._server_lock:
+            self._stop_server()
+            self._close_daemon_socket()
+        with self._prefetch_lock:
+            pool, self._prefetch_pool = self._prefetch_pool, None
+        if pool is not None:
+            pool.shutdown(wait=False)
+        self._file_path_cache.cache_clear()
+        self._file_path_cache_version = None
+        # data_version is per connection, so versions cached so far mean nothing
+        self._invalidate_read_caches()
+
+    def _drive_label_map(self, conn: sqlite3.Connection) -> Dict[int, Optional[str]]:
+        """drive_id -> label, reloaded only when the DB has changed since the last load.
+
+        drives holds a handful of rows, so list pages label their files from
+        this dict instead of joining drives for every file on the page.
+        """
+        version = conn.execute("PRAGMA data_version").fetchone()[0]
+        if version != self._drive_labels_version:
+            self._drive_labels = dict(conn.execute("SELECT drive_id, label FROM drives").fetchall())
+            self._drive_labels_version = version
+        return self._drive_labels
+
+    def _lookup_file_path(self, file_id: int) -> Optional[Dict[str, Any]]:
+        with self._conn_lock:
+            row = self._connection().execute("""
+                SELECT f.path_on_drive, d.mount_path
+                FROM files f
+                LEFT JOIN drives d ON d.drive_id = f.drive_id
+                WHERE f.file_id = ?
+            """, (file_id,)).fetchone()
+
+        if not row:
+            return None
+
+        path_on_drive = row[0] or ''
+        mount_path = row[1] or ''
+        if mount_path.strip():
+            full_path = os.path.join(mount_path, path_on_drive.lstrip('/'))
+        else:
+            full_path = path_on_drive
+
+        return {
+            'path_on_drive': path_on_drive,
+            'mount_path': mount_path,
+            'full_path': full_path
+        }
     
     def mark_file(self, file_id: int, status: str, note: str = '') -> Dict[str, Any]:
         """Mark file via JSON CLI."""
-        return self.run_json_command('mark', '--file-id', file_id, '--status', status, '--note', note)
+        return self._submit(['mark', '--file-id', file_id, '--status', status, '--note', note])
     
     def mark_group(self, group_id: int, status: str, note: str = '') -> Dict[str, Any]:
         """Mark group via JSON CLI."""
-        return self.run_json_command('mark-group', '--group-id', group_id, '--status', status, '--note', note)
+        return self._submit(['mark-group', '--group-id', group_id, '--status', status, '--note', note])
     
     def promote_file(self, file_id: int) -> Dict[str, Any]:
         """Promote file via JSON CLI."""
-        return self.run_json_command('promote', '--file-id', file_id)
+        return self._submit(['promote', '--file-id', file_id])
     
     def bulk_mark_preview(self, pattern: str, regex: bool = False, limit: int = 100, show_paths: bool = False) -> Dict[str, Any]:
         """Preview bulk mark operation."""
@@ -374,6 +963,7 @@ class MediaToolCLI:
         if regex:
             args.append('--regex')
         
+        self._invalidate_read_caches()
         return self.run_json_command(*args)
     
     def export_backup_list(self, filename: str, include_undecided: bool = False, include_large: bool = False) -> Dict[str, Any]:
@@ -394,52 +984,32 @@ class MediaToolCLI:
         
         return self.run_json_command(*args)
 
-    def get_groups_data(self, page: int = 1, per_page: int = 20, status: str = 'undecided') -> Dict[str, Any]:
-        """Get groups data - placeholder for now."""
-        return {
-            'groups': [],
-            'pagination': {
-                'page': page,
-                'per_page': per_page,
-                'total_groups': 0,
-                'total_pages': 0,
-                'has_prev': False,
-                'has_next': False
-            },
-            'status_filter': status
-        }
+    def get_groups_data(self, page: int = 1, per_page: int = 20, status: str = 'undecided',
+                        cursor: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Get groups data with pagination and proper status filtering.
+        
+        Pass the previous page's pagination['next_cursor'] as cursor to seek
+        straight past it instead of skipping `offset` rows.
+        """
+        return self._with_prefetch('groups', self._get_groups_data_raw, page, per_page, status, cursor)
     
-    def get_singles_data(self, page: int = 1, per_page: int = 50, status: str = 'undecided') -> Dict[str, Any]:
-        """Get singles data - placeholder for now."""
-        return {
-            'files': [],
-            'pagination': {
-                'page': page,
-                'per_page': per_page,
-                'total_files': 0,
-                'total_pages': 0,
-                'has_prev': False,
-                'has_next': False
-            },
-            'status_filter': status
-        }
-
-    def get_groups_data(self, page: int = 1, per_page: int = 20, status: str = 'undecided') -> Dict[str, Any]:
-        """Get groups data with pagination and proper status filtering."""
+    def _get_groups_data_raw(self, page: int, per_page: int, status: str,
+                             cursor: Optional[int]) -> Dict[str, Any]:
         try:
-            import sqlite3
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
+            with self._conn_lock:
+                conn = self._connection()
                 
-                print(f"🔍 Getting groups data: page={page}, per_page={per_page}, status={status}")
+                logger.debug("🔍 Getting groups data: page=%s, per_page=%s, status=%s", page, per_page, status)
                 
                 # Build status filter - we want groups that have files with the specified status
                 if status == 'all':
                     status_filter = ""
                     status_params = []
-                    print(f"📊 Filtering: All groups")
+                    logger.debug("📊 Filtering: All groups")
                 else:
-                    # Get groups that have at least one file with the specified status
+                    # Get groups that have at least one file with the specified
+                    # status; idx_files_group_status answers each probe
                     status_filter = """
                         AND EXISTS (
                             SELECT 1 FROM files f2 
@@ -448,82 +1018,103 @@ class MediaToolCLI:
                         )
                     """
                     status_params = [status]
-                    print(f"📊 Filtering: Groups with {status} files")
+                    logger.debug("📊 Filtering: Groups with %s files", status)
                 
                 # Get total groups count with filter
                 total_query = f"""
-                    SELECT COUNT(DISTINCT g.group_id) 
+                    SELECT COUNT(*) 
                     FROM groups g 
                     WHERE 1=1 {status_filter}
                 """
-                total_groups = conn.execute(total_query, status_params).fetchone()[0]
-                print(f"📊 Found {total_groups} groups matching filter")
+                total_groups = self._cached_count(conn, ('groups', status), total_query, status_params)
+                logger.debug("📊 Found %d groups matching filter", total_groups)
                 
                 # Calculate pagination
                 total_pages = max(1, (total_groups + per_page - 1) // per_page)
                 offset = (page - 1) * per_page
                 
-                # Get groups for current page
+                # Get groups for current page, by keyset when we have a cursor
+                if cursor is not None:
+                    page_filter, page_params = "AND g.group_id > ?", [cursor]
+                    offset = 0
+                else:
+                    page_filter, page_params = "", []
                 groups_query = f"""
-                    SELECT DISTINCT g.group_id, g.original_file_id
+                    SELECT g.group_id, g.original_file_id
                     FROM groups g
-                    WHERE 1=1 {status_filter}
+                    WHERE 1=1 {status_filter} {page_filter}
                     ORDER BY g.group_id
                     LIMIT ? OFFSET ?
                 """
                 
-                groups = conn.execute(groups_query, status_params + [per_page, offset]).fetchall()
-                print(f"📊 Retrieved {len(groups)} groups for page {page}")
+                groups = conn.execute(groups_query, status_params + page_params + [per_page, offset]).fetchall()
+                logger.debug("📊 Retrieved %d groups for page %s", len(groups), page)
+                
+                # Get files for all groups on this page in one query. SQLite
+                # builds the file dicts as one JSON array (plus a parallel
+                # array of group ids), so Python parses once per page instead
+                # of assembling a dict per row.
+                files_by_group = {}
+                status_counts_by_group = {}
+                if groups:
+                    page_ids = "),(".join("?" * len(groups))
+                    page_group_ids = [group['group_id'] for group in groups]
+                    group_ids_json, files_json = conn.execute(f"""
+                        WITH pg(gid) AS (VALUES ({page_ids}))
+                        SELECT json_group_array(group_id), json_group_array(json(file))
+                        FROM (
+                            SELECT f.group_id, json_object(
+                                'file_id', f.file_id,
+                                'path_on_drive', f.path_on_drive,
+                                'size_bytes', COALESCE(f.size_bytes, 0),
+                                'width', f.width,
+                                'height', f.height,
+                                'review_status', f.review_status,
+                                'type', f.type,
+                                'drive_id', f.drive_id,
+                                'is_original', json(CASE WHEN f.file_id = g.original_file_id THEN 'true' ELSE 'false' END)
+                            ) AS file
+                            FROM files f
+                            JOIN pg ON pg.gid = f.group_id
+                            LEFT JOIN groups g ON g.group_id = f.group_id
+                            ORDER BY f.group_id, f.file_id = g.original_file_id DESC, f.file_id
+                        )
+                    """, page_group_ids).fetchone()
+                    files = json.loads(files_json)
+                    drive_labels = self._drive_label_map(conn)
+                    for file in files:
+                        file['drive_label'] = drive_labels.get(file.pop('drive_id'))
+                    rows = zip(json.loads(group_ids_json), files)
+                    # json_group_array need not keep the subquery's order, so a
+                    # group's rows may come in more than one run; append each
+                    for group_id, group_rows in groupby(rows, key=itemgetter(0)):
+                        files_by_group.setdefault(group_id, []).extend(file for _, file in group_rows)
+                    
+                    # Per-group status histogram, answered from idx_files_group_status
+                    for group_id, review_status, count in conn.execute(f"""
+                        WITH pg(gid) AS (VALUES ({page_ids}))
+                        SELECT f.group_id, f.review_status, COUNT(*)
+                        FROM files f
+                        JOIN pg ON pg.gid = f.group_id
+                        GROUP BY f.group_id, f.review_status
+                    """, page_group_ids):
+                        status_counts_by_group.setdefault(group_id, {})[review_status] = count
                 
-                # Get files for each group
                 groups_data = []
                 for group in groups:
                     group_id = group['group_id']
-                    
-                    # Get all files in this group
-                    files = conn.execute("""
-                        SELECT 
-                            f.file_id, f.path_on_drive, f.size_bytes, f.width, f.height,
-                            f.review_status, f.type, f.group_id, f.duplicate_of,
-                            d.label as drive_label,
-                            CASE WHEN f.file_id = g.original_file_id THEN 1 ELSE 0 END as is_original
-                        FROM files f
-                        LEFT JOIN drives d ON d.drive_id = f.drive_id
-                        LEFT JOIN groups g ON g.group_id = f.group_id
-                        WHERE f.group_id = ?
-                        ORDER BY is_original DESC, f.file_id
-                    """, (group_id,)).fetchall()
-                    
-                    # Count files by status in this group
-                    status_counts = {}
-                    for file in files:
-                        status = file['review_status']
-                        status_counts[status] = status_counts.get(status, 0) + 1
+                    files = files_by_group.get(group_id, [])
                     
                     group_dict = {
                         'group_id': group_id,
                         'original_file_id': group['original_file_id'],
                         'file_count': len(files),
-                        'status_counts': status_counts
+                        'status_counts': status_counts_by_group.get(group_id, {})
                     }
                     
-                    files_list = []
-                    for file in files:
-                        files_list.append({
-                            'file_id': file['file_id'],
-                            'path_on_drive': file['path_on_drive'],
-                            'size_bytes': file['size_bytes'] or 0,
-                            'width': file['width'],
-                            'height': file['height'],
-                            'review_status': file['review_status'],
-                            'type': file['type'],
-                            'drive_label': file['drive_label'],
-                            'is_original': bool(file['is_original'])
-                        })
-                    
                     groups_data.append({
                         'group': group_dict,
-                        'files': files_list
+                        'files': files
                     })
                 
                 result = {
@@ -534,18 +1125,18 @@ class MediaToolCLI:
                         'total_groups': total_groups,
                         'total_pages': total_pages,
                         'has_prev': page > 1,
-                        'has_next': page < total_pages
+                        'has_next': page < total_pages,
+                        'next_cursor': groups[-1]['group_id'] if groups else None
                     },
                     'status_filter': status
                 }
                 
-                print(f"✅ Returning {len(groups_data)} groups, page {page} of {total_pages}")
+                logger.debug("✅ Returning %d groups, page %s of %d", len(groups_data), page, total_pages)
                 return result
                 
         except Exception as e:
-            print(f"❌ Error getting groups data: {e}")
-            import traceback
-            traceback.print_exc()
+            # Stack only when debugging; the one-line error is enough otherwise
+            logger.error(f"❌ Error getting groups data: {e}", exc_info=logger.isEnabledFor(logging.DEBUG))
             return {
                 'error': str(e),
                 'groups': [],
@@ -560,12 +1151,16 @@ class MediaToolCLI:
                 'status_filter': status
             }
 
-    def get_singles_data(self, page: int = 1, per_page: int = 50, status: str = 'undecided') -> Dict[str, Any]:
-        """Get singles (non-grouped files) data with pagination."""
+    def get_singles_data(self, page: int = 1, per_page: int = 50, status: str = 'undecided',
+                         cursor: Optional[int] = None) -> Dict[str, Any]:
+        """Get singles (non-grouped files) data with pagination (keyset when cursor is given)."""
+        return self._with_prefetch('singles', self._get_singles_data_raw, page, per_page, status, cursor)
+    
+    def _get_singles_data_raw(self, page: int, per_page: int, status: str,
+                              cursor: Optional[int]) -> Dict[str, Any]:
         try:
-            import sqlite3
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
+            with self._conn_lock:
+                conn = self._connection()
                 
                 # Build status filter
                 if status == 'all':
@@ -581,38 +1176,43 @@ class MediaToolCLI:
                     FROM files f 
                     WHERE f.group_id IS NULL {status_filter}
                 """
-                total_files = conn.execute(total_query, status_params).fetchone()[0]
+                total_files = self._cached_count(conn, ('singles', status), total_query, status_params)
                 
                 # Calculate pagination
                 total_pages = (total_files + per_page - 1) // per_page
                 offset = (page - 1) * per_page
                 
-                # Get files for current page
+                # Get files for current page, by keyset when we have a cursor
+                if cursor is not None:
+                    page_filter, page_params = "AND f.file_id > ?", [cursor]
+                    offset = 0
+                else:
+                    page_filter, page_params = "", []
+                # SQLite emits the page as one JSON array of file dicts
                 files_query = f"""
-                    SELECT 
-                        f.file_id, f.path_on_drive, f.size_bytes, f.width, f.height,
-                        f.review_status, f.type, d.label as drive_label
-                    FROM files f
-                    LEFT JOIN drives d ON d.drive_id = f.drive_id
-                    WHERE f.group_id IS NULL {status_filter}
-                    ORDER BY f.file_id
-                    LIMIT ? OFFSET ?
+                    SELECT json_group_array(json(file))
+                    FROM (
+                        SELECT json_object(
+                            'file_id', f.file_id,
+                            'path_on_drive', f.path_on_drive,
+                            'size_bytes', COALESCE(f.size_bytes, 0),
+                            'width', f.width,
+                            'height', f.height,
+                            'review_status', f.review_status,
+                            'type', f.type,
+                            'drive_id', f.drive_id
+                        ) AS file
+                        FROM files f
+                        WHERE f.group_id IS NULL {status_filter} {page_filter}
+                        ORDER BY f.file_id
+                        LIMIT ? OFFSET ?
+                    )
                 """
                 
-                files = conn.execute(files_query, status_params + [per_page, offset]).fetchall()
-                
-                files_list = []
-                for file in files:
-                    files_list.append({
-                        'file_id': file['file_id'],
-                        'path_on_drive': file['path_on_drive'],
-                        'size_bytes': file['size_bytes'] or 0,
-                        'width': file['width'],
-                        'height': file['height'],
-                        'review_status': file['review_status'],
-                        'type': file['type'],
-                        'drive_label': file['drive_label']
-                    })
+                files_list = json.loads(conn.execute(files_query, status_params + page_params + [per_page, offset]).fetchone()[0])
+                drive_labels = self._drive_label_map(conn)
+                for file in files_list:
+                    file['drive_label'] = drive_labels.get(file.pop('drive_id'))
                 
                 return {
                     'files': files_list,
@@ -622,13 +1222,14 @@ class MediaToolCLI:
                         'total_files': total_files,
                         'total_pages': total_pages,
                         'has_prev': page > 1,
-                        'has_next': page < total_pages
+                        'has_next': page < total_pages,
+                        'next_cursor': files_list[-1]['file_id'] if files_list else None
                     },
                     'status_filter': status
                 }
                 
         except Exception as e:
-            print(f"❌ Error getting singles data: {e}")
+            logger.error(f"❌ Error getting singles data: {e}")
             return {
                 'error': str(e),
                 'files': [],
@@ -643,73 +1244,112 @@ class MediaToolCLI:
                 'status_filter': status
             }
 
+    def _invalidate_read_caches(self):
+        """Drop cached totals and prefetched pages after a write."""
+        self._count_cache.clear()
+        self._stats_cache.clear()
+        self._drive_labels_version = None
+        with self._prefetch_lock:
+            for future, _ in self._prefetch_cache.values():
+                future.cancel()
+            self._prefetch_cache.clear()
+    
+    def _data_version(self) -> Optional[int]:
+        """PRAGMA data_version of the shared connection, or None if it can't be read.
+
+        A change since the last check also empties the file path cache.
+        """
+        try:
+            with self._conn_lock:
+                version = self._connection().execute("PRAGMA data_version").fetchone()[0]
+        except sqlite3.Error:
+            return None
+        if version != self._file_path_cache_version:
+            self._file_path_cache.cache_clear()
+            self._file_path_cache_version = version
+        return version
+
+    def _with_prefetch(self, kind: str, fetch, page: int, per_page: int, status: str,
+                       cursor: Optional[int]) -> Dict[str, Any]:
+        """Serve a page from the prefetch cache if still current, then queue the next one."""
+        with self._prefetch_lock:
+            entry = self._prefetch_cache.pop((kind, page, per_page, status, cursor), None)
+        
+        result = None
+        if entry is not None:
+            future, version = entry
+            # Someone committed since it was scheduled; the page may be stale
+            if version is None or version != self._data_version():
+                future.cancel()
+            else:
+                try:
+                    result = future.result()
+                except Exception:
+                    result = None
+        if result is None or 'error' in result:
+            result = fetch(page, per_page, status, cursor)
+        
+        pagination = result.get('pagination', {})
+        next_cursor = pagination.get('next_cursor')
+        if pagination.get('has_next') and next_cursor is not None:
+            self._schedule_prefetch((kind, page + 1, per_page, status, next_cursor), fetch)
+        return result
+    
+    def _schedule_prefetch(self, key: tuple, fetch):
+        """Start loading the page for key in the background unless it is already queued."""
+        with self._prefetch_lock:
+            if key in self._prefetch_cache:
+                return
+            if self._prefetch_pool is None:
+                self._prefetch_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="mcrt-prefetch")
+            pool = self._prefetch_pool
+        
+        version = self._data_version()
+        if version is None:
+            return
+        # Submitted with no lock held, so request threads never queue behind it
+        try:
+            future = pool.submit(fetch, *key[1:])
+        except RuntimeError:
+            return  # close() shut the pool down meanwhile
+        
+        with self._prefetch_lock:
+            if key in self._prefetch_cache:
+                future.cancel()  # another request thread queued it first
+                return
+            while len(self._prefetch_cache) >= PREFETCH_MAX_PAGES:
+                self._prefetch_cache.pop(next(iter(self._prefetch_cache)))[0].cancel()
+            self._prefetch_cache[key] = (future, version)
+    
+    def _cached_count(self, conn: sqlite3.Connection, key: Tuple[str, str], query: str, params: List[Any]) -> int:
+        """Run a pagination COUNT query, reusing the last result while the DB is unchanged.
+        
+        data_version moves whenever another connection commits to the file, which
+        also catches WAL writes that leave the main file's mtime untouched.
+        """
+        version = conn.execute("PRAGMA data_version").fetchone()[0]
+        hit = self._count_cache.get(key)
+        if hit is not None and hit[1] == version:
+            return hit[0]
+        count = conn.execute(query, params).fetchone()[0]
+        self._count_cache[key] = (count, version)
+        return count
+    
     def get_file_info(self, file_id: int) -> Dict[str, Any]:
         """Get detailed file information with complete path display."""
         try:
-            import sqlite3
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                
-                # First, let's check what columns actually exist
-                cursor = conn.execute("PRAGMA table_info(files)")
-                columns = [row[1] for row in cursor.fetchall()]
-                print(f"🔍 Available columns in files table: {columns}")
-                
-                # Build query with only existing columns
-                base_columns = [
-                    'f.file_id', 'f.path_on_drive', 'f.size_bytes', 'f.width', 'f.height',
-                    'f.review_status', 'f.type', 'f.group_id', 'f.duplicate_of', 
-                    'f.created_at', 'f.is_large'
-                ]
-                
-                # Add optional columns if they exist
-                optional_columns = []
-                if 'review_note' in columns:
-                    optional_columns.append('f.review_note')
-                if 'hash_sha256' in columns:
-                    optional_columns.append('f.hash_sha256')
-                if 'phash' in columns:  # Note: it's 'phash', not 'hash_phash'
-                    optional_columns.append('f.phash')
-                if 'reviewed_at' in columns:
-                    optional_columns.append('f.reviewed_at')
-                
-                all_columns = base_columns + optional_columns
-                
-                # Build the full query
-                query = f"""
-                    SELECT 
-                        {', '.join(all_columns)},
-                        d.label as drive_label, 
-                        d.mount_path,
-                        CASE WHEN f.file_id = g.original_file_id THEN 1 ELSE 0 END as is_original
-                    FROM files f
-                    LEFT JOIN drives d ON d.drive_id = f.drive_id
-                    LEFT JOIN groups g ON g.group_id = f.group_id
-                    WHERE f.file_id = ?
-                """
+            with self._conn_lock:
+                conn = self._connection()
                 
-                print(f"🔍 Executing query for file {file_id}")
-                file_info = conn.execute(query, (file_id,)).fetchone()
+                logger.debug("🔍 Executing query for file %s", file_id)
+                file_info = conn.execute(FILE_INFO_SQL, (file_id,)).fetchone()
                 
                 if not file_info:
                     return {'error': f'File {file_id} not found'}
                 
-                # Build complete file path
                 mount_path = file_info['mount_path'] or ''
                 path_on_drive = file_info['path_on_drive'] or ''
-                
-                if mount_path and mount_path.strip():
-                    complete_path = f"{mount_path.rstrip('/')}/{path_on_drive.lstrip('/')}"
-                else:
-                    complete_path = path_on_drive
-                
-                # Helper function to safely get values from sqlite3.Row
-                def safe_get(row, key, default=None):
-                    """Safely get a value from sqlite3.Row, handling missing columns."""
-                    try:
-                        return row[key] if row[key] is not None else default
-                    except (IndexError, KeyError):
-                        return default
+                complete_path = file_info['complete_path']
                 
                 # Prepare result with safe column access using sqlite3.Row indexing
                 result = {
@@ -726,25 +1366,18 @@ class MediaToolCLI:
                     'duplicate_of': file_info['duplicate_of'],
                     'drive_label': file_info['drive_label'],
                     'is_original': bool(file_info['is_original']) if file_info['is_original'] else False,
-                    'is_large': bool(safe_get(file_info, 'is_large', 0)),
+                    'is_large': bool(file_info['is_large']),
                     'created_at': file_info['created_at'],
                 }
                 
-                # Add optional fields if they exist in the columns
-                if 'review_note' in columns:
-                    result['review_note'] = safe_get(file_info, 'review_note', '')
-                if 'hash_sha256' in columns:
-                    result['hash_sha256'] = safe_get(file_info, 'hash_sha256', '')
-                if 'phash' in columns:
-                    result['phash'] = safe_get(file_info, 'phash', '')
-                if 'reviewed_at' in columns:
-                    result['reviewed_at'] = safe_get(file_info, 'reviewed_at', '')
+                # Optional fields, reported as '' when unset
+                for key in FILE_INFO_OPTIONAL_COLUMNS:
+                    value = file_info[key]
+                    result[key] = value if value is not None else ''
                 
-                print(f"✅ Successfully retrieved file info for {file_id}")
+                logger.debug("✅ Successfully retrieved file info for %s", file_id)
                 return result
                 
         except Exception as e:
-            print(f"❌ Error getting file info: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.error(f"❌ Error getting file info: {e}", exc_info=logger.isEnabledFor(logging.DEBUG))
             return {'error': str(e)}
\ No newline at end of file